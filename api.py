@@ -0,0 +1,278 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+
+import pandas as pd
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, FileResponse
+
+from schedule_catalog import ScheduleCatalog, model_example_path
+from schedule_engine import build_month_matrix, build_day_schedule, compile_legend
+from columnar_store import load_schedule_frame
+from schedule_diff import changelog_path, load_changelog, query_changelog
+from daily_export import build_export_key, get_export_manifest_path, needs_export
+from range_export import FORMATS, ExportError, export_file_name, export_range
+import perf_metrics
+from perf_metrics import timed
+
+# -------------------------------------------------------------------
+# 근무표 JSON API (Streamlit / Git 과 무관하게 독립 실행)
+#   실행 예: uvicorn api:app --host 0.0.0.0 --port 8000
+# -------------------------------------------------------------------
+repo_root = os.path.dirname(os.path.abspath(__file__))
+today_schedules_root_dir = os.path.join(repo_root, "team_today_schedules")
+schedules_root_dir = os.path.join(repo_root, "team_schedules")
+model_example_root_dir = os.path.join(repo_root, "team_model_example")
+changelog_root_dir = os.path.join(repo_root, "team_changelog")
+MAX_RANGE_DAYS = 366
+
+catalog = ScheduleCatalog(schedules_root_dir)
+_matrix_cache = {}  # (team, year, month) -> (파일 지문, ShiftMatrix)
+_legend_cache = {}  # 범례 경로 -> (파일 지문, CompiledLegend)
+
+app = FastAPI(title="RSW Schedule API")
+perf_metrics.registry.dump_path = None  # 스냅샷 파일은 Streamlit 앱 전용 (API 지표는 /metrics 로 직접 제공)
+
+def error_response(status_code, message):
+    return JSONResponse({"status": "error", "message": message}, status_code=status_code)
+
+def parse_date(date_str):
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+def list_teams():
+    catalog.refresh_if_changed()
+    teams = set(catalog.teams())
+    if os.path.isdir(today_schedules_root_dir):
+        teams.update(
+            name for name in os.listdir(today_schedules_root_dir)
+            if os.path.isdir(os.path.join(today_schedules_root_dir, name))
+        )
+    return sorted(teams)
+
+def get_json_file_path(date, team):
+    date_str = date.strftime("%Y-%m-%d")
+    return os.path.join(today_schedules_root_dir, team, date_str[:7], f"{date_str}_schedule.json")
+
+# -------------------------------------------------------------------
+# 조건부 응답 (ETag / Last-Modified → 304)
+#   파일 내용을 읽지 않고 (mtime, size) 만으로 검증자 생성
+# -------------------------------------------------------------------
+def build_validators(file_paths):
+    stats = []
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+        stats.append(f"{file_path}:{stat.st_mtime_ns}:{stat.st_size}")
+    digest = hashlib.sha1("|".join(stats).encode("utf-8")).hexdigest()
+    last_modified = max((os.stat(p).st_mtime for p in file_paths), default=0)
+    return f'W/"{digest}"', formatdate(last_modified, usegmt=True), last_modified
+
+def is_not_modified(request, etag, last_modified_ts):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified_ts) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def read_bytes(file_path):
+    with open(file_path, "rb") as f:
+        return f.read()
+
+# -------------------------------------------------------------------
+# 📖 범례는 파일이 바뀐 경우에만 다시 컴파일
+# -------------------------------------------------------------------
+def load_legend(model_path):
+    stat = os.stat(model_path)
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+    cached = _legend_cache.get(model_path)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+    legend = compile_legend(pd.read_csv(model_path))
+    _legend_cache[model_path] = (fingerprint, legend)
+    return legend
+
+# -------------------------------------------------------------------
+# 📚 JSON 산출물이 아직 없으면 카탈로그로 원본 CSV 를 찾아 바로 계산
+# -------------------------------------------------------------------
+@timed("api.load_month_matrix")
+def load_month_matrix(team, year, month):
+    catalog.refresh_if_changed()
+    schedule_path = catalog.path_for(team, year, month)
+    model_path = model_example_path(model_example_root_dir, team)
+    if not schedule_path or not os.path.exists(model_path):
+        return None, []
+
+    source_paths = [schedule_path, model_path]
+    fingerprint = tuple((os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in source_paths)
+    cached = _matrix_cache.get((team, year, month))
+    if cached and cached[0] == fingerprint:
+        return cached[1], source_paths
+
+    matrix = build_month_matrix(load_schedule_frame(schedule_path), load_legend(model_path), year, month)
+    _matrix_cache[(team, year, month)] = (fingerprint, matrix)
+    return matrix, source_paths
+
+def resolve_day(team, date):
+    # 반환: (검증용 파일 목록, 본문 생성 함수) 또는 None
+    #   일별 JSON 은 매니페스트가 현재 근무표 / 범례 / 포맷 버전과 같을 때만 그대로 사용
+    json_file_path = get_json_file_path(date, team)
+    catalog.refresh_if_changed()
+    schedule_path = catalog.path_for(team, date.year, date.month)
+    model_path = model_example_path(model_example_root_dir, team)
+    if not schedule_path or not os.path.exists(model_path):
+        # 원본이 없으면 비교할 대상이 없으므로 남아 있는 JSON 을 그대로 제공
+        if os.path.exists(json_file_path):
+            return [json_file_path], lambda: read_bytes(json_file_path)
+        return None
+
+    manifest_path = get_export_manifest_path(os.path.dirname(json_file_path))
+    if os.path.exists(json_file_path) and not needs_export(manifest_path, build_export_key(schedule_path, model_path)):
+        return [json_file_path, manifest_path, schedule_path, model_path], lambda: read_bytes(json_file_path)
+
+    matrix, source_paths = load_month_matrix(team, date.year, date.month)
+    if matrix is None or not matrix.has_date(date):
+        return None
+    return source_paths, lambda: json.dumps(build_day_schedule(matrix, date), ensure_ascii=False).encode("utf-8")
+
+def conditional_json(request, file_paths, build_body):
+    etag, last_modified, last_modified_ts = build_validators(file_paths)
+    headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": "no-cache"}
+    if is_not_modified(request, etag, last_modified_ts):
+        return Response(status_code=304, headers=headers)
+    return Response(content=build_body(), media_type="application/json", headers=headers)
+
+# -------------------------------------------------------------------
+# 1) 팀 / 날짜 단건 조회: /schedule/{team}/{date}
+# -------------------------------------------------------------------
+@app.get("/schedule/{team}/{date_str}")
+def get_schedule(team: str, date_str: str, request: Request):
+    if team not in list_teams():
+        return error_response(404, f"{team} 팀을 찾을 수 없습니다.")
+    date = parse_date(date_str)
+    if date is None:
+        return error_response(400, "날짜 형식은 YYYY-MM-DD 이어야 합니다.")
+
+    resolved = resolve_day(team, date)
+    if resolved is None:
+        return error_response(404, f"{date_str} ({team})에 해당하는 데이터를 찾을 수 없습니다.")
+
+    # 저장된 JSON 바이트를 그대로 감싸서 재파싱/재직렬화 생략
+    file_paths, read_body = resolved
+    return conditional_json(request, file_paths, lambda: b'{"data":' + read_body() + b"}")
+
+# -------------------------------------------------------------------
+# 2) 기간 조회: /schedule/{team}?start=YYYY-MM-DD&end=YYYY-MM-DD
+# -------------------------------------------------------------------
+@app.get("/schedule/{team}")
+def get_schedule_range(team: str, start: str, end: str, request: Request):
+    if team not in list_teams():
+        return error_response(404, f"{team} 팀을 찾을 수 없습니다.")
+    start_date, end_date = parse_date(start), parse_date(end)
+    if start_date is None or end_date is None:
+        return error_response(400, "날짜 형식은 YYYY-MM-DD 이어야 합니다.")
+    if end_date < start_date:
+        return error_response(400, "end 는 start 이후 날짜여야 합니다.")
+    if (end_date - start_date).days >= MAX_RANGE_DAYS:
+        return error_response(400, f"조회 기간은 최대 {MAX_RANGE_DAYS}일 입니다.")
+
+    file_paths = []
+    readers = []
+    for offset in range((end_date - start_date).days + 1):
+        resolved = resolve_day(team, start_date + timedelta(days=offset))
+        if resolved is not None:
+            file_paths.extend(resolved[0])
+            readers.append(resolved[1])
+
+    return conditional_json(request, sorted(set(file_paths)),
+                            lambda: b'{"data":[' + b",".join(read() for read in readers) + b"]}")
+
+# -------------------------------------------------------------------
+# 3) 여러 팀 동시 조회: /schedules/{date}?teams=관제SO팀,동부SO팀 (생략 시 전체 팀)
+# -------------------------------------------------------------------
+@app.get("/schedules/{date_str}")
+def get_multi_team_schedule(date_str: str, request: Request, teams: str = ""):
+    date = parse_date(date_str)
+    if date is None:
+        return error_response(400, "날짜 형식은 YYYY-MM-DD 이어야 합니다.")
+
+    available_teams = list_teams()
+    selected_teams = [t.strip() for t in teams.split(",") if t.strip()] or available_teams
+    unknown_teams = [t for t in selected_teams if t not in available_teams]
+    if unknown_teams:
+        return error_response(404, f"{', '.join(unknown_teams)} 팀을 찾을 수 없습니다.")
+
+    resolved_teams = {team: resolve_day(team, date) for team in selected_teams}
+    resolved_teams = {team: resolved for team, resolved in resolved_teams.items() if resolved is not None}
+    file_paths = [path for resolved in resolved_teams.values() for path in resolved[0]]
+
+    def build_body():
+        items = [json.dumps(team, ensure_ascii=False).encode("utf-8") + b":" + resolved[1]()
+                 for team, resolved in resolved_teams.items()]
+        return b'{"date":"' + date.strftime("%Y-%m-%d").encode("utf-8") + b'","data":{' + b",".join(items) + b"}}"
+
+    return conditional_json(request, file_paths, build_body)
+
+# -------------------------------------------------------------------
+# 4) 기간 / 여러 팀 내보내기: /export?start=&end=&teams=&layout=roster|daily&format=csv|xlsx
+#    같은 입력(근무표 / 범례 지문 + 조건)이면 캐시된 파일을 디스크에서 그대로 전송
+# -------------------------------------------------------------------
+@app.get("/export")
+def get_export(start: str, end: str, teams: str = "", layout: str = "roster", format: str = "csv"):
+    start_date, end_date = parse_date(start), parse_date(end)
+    if start_date is None or end_date is None:
+        return error_response(400, "날짜 형식은 YYYY-MM-DD 이어야 합니다.")
+
+    available_teams = list_teams()
+    selected_teams = [t.strip() for t in teams.split(",") if t.strip()] or available_teams
+    unknown_teams = [t for t in selected_teams if t not in available_teams]
+    if unknown_teams:
+        return error_response(404, f"{', '.join(unknown_teams)} 팀을 찾을 수 없습니다.")
+
+    try:
+        export_path = export_range(catalog, model_example_root_dir, selected_teams, start_date, end_date,
+                                   lambda team, year, month, _path: load_month_matrix(team, year, month)[0],
+                                   layout, format)
+    except ExportError as e:
+        return error_response(400, str(e))
+    return FileResponse(export_path, media_type=FORMATS[format],
+                        filename=export_file_name(selected_teams, start_date, end_date, layout, format))
+
+# -------------------------------------------------------------------
+# 5) 근무표 변경 이력: /changelog/{team}?month=YYYY-MM&name=홍길동&date=YYYY-MM-DD (최신순)
+# -------------------------------------------------------------------
+@app.get("/changelog/{team}")
+def get_changelog(team: str, month: str, request: Request, name: str = "", date: str = ""):
+    if team not in list_teams():
+        return error_response(404, f"{team} 팀을 찾을 수 없습니다.")
+    try:
+        month_date = datetime.strptime(month, "%Y-%m")
+    except ValueError:
+        return error_response(400, "월 형식은 YYYY-MM 이어야 합니다.")
+    if date and parse_date(date) is None:
+        return error_response(400, "날짜 형식은 YYYY-MM-DD 이어야 합니다.")
+
+    log_path = changelog_path(changelog_root_dir, team, month_date.year, month_date.month)
+    if not os.path.exists(log_path):
+        return error_response(404, f"{month} ({team}) 변경 이력이 없습니다.")
+
+    def build_body():
+        changelog = query_changelog(load_changelog(log_path), name=name, date=date)
+        return b'{"data":' + changelog.to_json(orient="records", force_ascii=False).encode("utf-8") + b"}"
+
+    return conditional_json(request, [log_path], build_body)
+
+# -------------------------------------------------------------------
+# ⏱️ 모니터링 수집기용 성능 지표 (Streamlit 앱이 저장한 스냅샷 + API 자체 지표)
+# -------------------------------------------------------------------
+@app.get("/metrics")
+def get_metrics():
+    return {"app": perf_metrics.load_dump(), "api": perf_metrics.registry.snapshot()}
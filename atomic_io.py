@@ -0,0 +1,120 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 실행 시에는 프로세스 내 잠금만 사용
+    fcntl = None
+
+# -------------------------------------------------------------------
+# 🔒 파일 단위 잠금 (프로세스 내 스레드 + 다른 프로세스(Streamlit 워커) 모두 직렬화)
+#   - 잠금 파일은 데이터 폴더가 아닌 임시 폴더에 경로 해시 이름으로 생성
+#   - 같은 스레드에서 다시 잠가도 교착되지 않음 (예: 메모 압축 중 원자적 쓰기)
+# -------------------------------------------------------------------
+LOCK_DIR = os.path.join(tempfile.gettempdir(), "rsw_locks")
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+def lock_file_path(path):
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(LOCK_DIR, f"{digest}.lock")
+
+def _get_path_lock(path):
+    with _path_locks_guard:
+        return _path_locks.setdefault(os.path.abspath(path), threading.RLock())
+
+class FileLock:
+    _local = threading.local()  # 스레드별 {경로: 잠금 깊이}, {경로: flock 핸들}
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.thread_lock = _get_path_lock(path)
+
+    def _held(self):
+        if not hasattr(self._local, "depth"):
+            self._local.depth = {}
+            self._local.handles = {}
+        return self._local.depth
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        held = self._held()
+        if held.get(self.path, 0) == 0 and fcntl is not None:
+            handle = None
+            try:
+                os.makedirs(LOCK_DIR, exist_ok=True)
+                handle = open(lock_file_path(self.path), "a")
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            except BaseException:
+                # 잠금 파일을 열 수 없으면(권한 / 디스크 / 파일 수 제한) 스레드 잠금도 풀고 실패 전달
+                if handle is not None:
+                    handle.close()
+                self.thread_lock.release()
+                raise
+            self._local.handles[self.path] = handle
+        held[self.path] = held.get(self.path, 0) + 1
+        return self
+
+    def __exit__(self, *exc):
+        held = self._held()
+        held[self.path] -= 1
+        if held[self.path] == 0:
+            # 가장 바깥쪽 잠금이 끝날 때만 flock 해제
+            del held[self.path]
+            handle = self._local.handles.pop(self.path, None)
+            if handle is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+        self.thread_lock.release()
+
+# -------------------------------------------------------------------
+# 💾 원자적 쓰기: 같은 폴더의 임시 파일 → fsync → rename
+#   읽는 쪽은 항상 이전 파일 전체 또는 새 파일 전체만 보게 됨
+# -------------------------------------------------------------------
+@contextmanager
+def atomic_output(path):
+    # 큰 산출물(내보내기 파일 등)을 메모리에 모으지 않고 임시 파일에 바로 스트리밍
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with FileLock(path):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)  # mkstemp 기본값(0600) 대신 일반 파일 권한
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        _fsync_directory(directory)
+
+def write_bytes_atomic(path, data):
+    with atomic_output(path) as f:
+        f.write(data)
+
+def write_text_atomic(path, text, encoding="utf-8"):
+    write_bytes_atomic(path, text.encode(encoding))
+
+def write_json_atomic(path, data, indent=4):
+    write_text_atomic(path, json.dumps(data, ensure_ascii=False, indent=indent))
+
+def _fsync_directory(directory):
+    # rename 결과까지 디스크에 반영 (지원하지 않는 OS 에서는 생략)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,261 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from git import Repo
+
+import memo_store
+import perf_metrics
+from git_sync import commit_files, push_changes
+from columnar_store import load_schedule_frame
+from staffing_coverage import month_coverage, coverage_report, coverage_summary, coverage_gaps
+from daily_export import export_month_json
+from schedule_catalog import ScheduleCatalog, model_example_path, schedule_file_name
+from schedule_engine import build_month_matrix, compile_legend, month_dates, WEEKDAYS, VACATION_KEYWORDS
+
+# -------------------------------------------------------------------
+# 📊 벤치마크: 번들 데이터 / 합성 데이터로 핵심 로직 처리 시간 측정
+#   python bench.py                                   # 번들 데이터 (team_schedules 등)
+#   python bench.py --synthetic --people 500 --months 12 --teams 50
+#   python bench.py --json result.json                # 결과 저장
+#   python bench.py --baseline result.json            # 이전 결과 대비 느려지면 종료 코드 1
+#   - 모든 작업은 임시 폴더의 복사본 + 로컬 bare 원격 저장소에서 수행 (저장소 변경 없음)
+# -------------------------------------------------------------------
+repo_root = os.path.dirname(os.path.abspath(__file__))
+perf_metrics.registry.dump_path = None  # 앱 스냅샷 파일(RSW_METRICS_PATH)을 벤치마크 측정값으로 덮어쓰지 않음
+DEFAULT_TOLERANCE = 1.25
+NOISE_FLOOR_SECONDS = 0.005
+
+# -------------------------------------------------------------------
+# 작업 공간 준비
+# -------------------------------------------------------------------
+def copy_bundled_data(workspace):
+    for folder in ["team_schedules", "team_model_example"]:
+        shutil.copytree(os.path.join(repo_root, folder), os.path.join(workspace, folder),
+                        ignore=shutil.ignore_patterns("*.rswc", "*.tmp"))
+
+def write_synthetic_data(workspace, people, months, teams, seed=0):
+    rng = np.random.default_rng(seed)
+    legend = pd.read_csv(model_example_path(os.path.join(repo_root, "team_model_example"), "관제SO팀"))
+    vocabulary = legend["팀 근무기호"].dropna().astype(str).unique().tolist() + VACATION_KEYWORDS
+    parts = ["총괄", "전국망", "보안", "서버", "네트워크"]
+    start_year = datetime.now().year - 1
+
+    for team_index in range(teams):
+        team = f"합성{team_index:02d}팀"
+        model_dir = os.path.join(workspace, "team_model_example", team)
+        os.makedirs(model_dir, exist_ok=True)
+        legend.to_csv(model_example_path(os.path.join(workspace, "team_model_example"), team),
+                      index=False, encoding="utf-8-sig")
+        schedule_dir = os.path.join(workspace, "team_schedules", team)
+        os.makedirs(schedule_dir, exist_ok=True)
+        for month_index in range(months):
+            year, month = start_year + month_index // 12, month_index % 12 + 1
+            columns = {
+                "본부 구분": ["SO"] * people,
+                "팀 구분": [team] * people,
+                "파트 구분": rng.choice(parts, people),
+                "년/월": [year * 100 + month] * people,
+                "이름": [f"구성원{i:04d}" for i in range(people)],
+                "근무 구분": ["교대근무"] * people,
+            }
+            for date in month_dates(year, month):
+                columns[f"{date.day}({WEEKDAYS[date.weekday()]})"] = rng.choice(vocabulary, people)
+            pd.DataFrame(columns).to_csv(os.path.join(schedule_dir, schedule_file_name(team, year, month)),
+                                         index=False, encoding="utf-8-sig")
+
+def init_git_workspace(workspace):
+    remote_path = os.path.join(workspace, "remote.git")
+    Repo.init(remote_path, bare=True, initial_branch="main")
+    repo = Repo.init(workspace, initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "bench")
+        config.set_value("user", "email", "bench@localhost")
+    repo.create_remote("origin", remote_path)
+    return repo, remote_path
+
+class Workspace:
+    def __init__(self, path, export_teams):
+        self.path = path
+        self.catalog = ScheduleCatalog(os.path.join(path, "team_schedules"))
+        self.catalog.refresh()
+        self.entries = self.catalog.entries()
+        self.legends = {team: compile_legend(pd.read_csv(model_example_path(os.path.join(path, "team_model_example"), team)))
+                        for team in self.catalog.teams()}
+        self.frames = {}
+        self.matrices = {}
+        self.export_entries = [entry for entry in self.entries if entry[0][0] in self.catalog.teams()[:export_teams]]
+        self.today_dir = os.path.join(path, "team_today_schedules")
+        self.memo_path = os.path.join(path, "team_memo", "bench_memos.jsonl")
+        self.repo, self.remote_url = init_git_workspace(path)
+
+# -------------------------------------------------------------------
+# 개별 벤치마크 (setup 은 측정에서 제외)
+# -------------------------------------------------------------------
+def bench_csv_parse(ws):
+    for _key, path in ws.entries:
+        pd.read_csv(path)
+
+def setup_columnar(ws):
+    for _key, path in ws.entries:
+        load_schedule_frame(path)  # 압축 저장본(.rswc) 생성
+
+def bench_columnar_load(ws):
+    for _key, path in ws.entries:
+        ws.frames[path] = load_schedule_frame(path)
+
+def bench_classify(ws):
+    for (team, year, month), path in ws.entries:
+        ws.matrices[(team, year, month)] = build_month_matrix(ws.frames[path], ws.legends[team], year, month)
+
+def bench_coverage(ws):
+    report = coverage_report([month_coverage(ws.matrices[key], key[0]) for key, _path in ws.entries])
+    coverage_summary(report)
+    coverage_gaps(report)
+
+def setup_export_cold(ws):
+    shutil.rmtree(ws.today_dir, ignore_errors=True)
+
+def bench_export(ws):
+    changed = []
+    for (team, year, month), _path in ws.export_entries:
+        changed += export_month_json(month_dates(year, month), os.path.join(ws.today_dir, team),
+                                     ws.matrices[(team, year, month)])
+    return changed
+
+def setup_memo(ws):
+    if os.path.exists(ws.memo_path):
+        os.remove(ws.memo_path)
+
+def bench_memo(ws, memos=500, reads=100, deletes=100):
+    added = [memo_store.add_memo(ws.memo_path, f"메모 {i}", "bench", f"bench-{i:06d}")
+             for i in range(memos)]
+    for _ in range(reads):
+        memo_store.load_recent_memos(ws.memo_path, 10)
+    for memo in added[:deletes]:
+        memo_store.delete_memo(ws.memo_path, memo["id"])
+
+def touch_export_files(ws):
+    # 커밋할 변경이 생기도록 일별 JSON 끝에 공백 한 칸 추가
+    paths = []
+    for (team, year, month), _path in ws.export_entries[:1]:
+        for date in month_dates(year, month):
+            path = os.path.join(ws.today_dir, team, date.strftime("%Y-%m"), f"{date.strftime('%Y-%m-%d')}_schedule.json")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(" ")
+            paths.append(path)
+    ws.touched = paths
+
+def bench_git_batched(ws):
+    commit_files(ws.repo, ws.touched, "bench: batched")
+    push_changes(ws.repo, ws.remote_url)
+
+def bench_git_per_file(ws):
+    for path in ws.touched:
+        commit_files(ws.repo, [path], "bench: per file")
+    push_changes(ws.repo, ws.remote_url)
+
+BENCHMARKS = [
+    ("csv_parse", None, bench_csv_parse),
+    ("columnar_load", setup_columnar, bench_columnar_load),
+    ("classify", None, bench_classify),
+    ("coverage", None, bench_coverage),
+    ("json_export_cold", setup_export_cold, bench_export),
+    ("json_export_unchanged", None, bench_export),
+    ("memo_store", setup_memo, bench_memo),
+    ("git_batched_commit_push", touch_export_files, bench_git_batched),
+    ("git_per_file_commit_push", touch_export_files, bench_git_per_file),
+]
+
+# -------------------------------------------------------------------
+# 실행 / 결과 비교
+# -------------------------------------------------------------------
+def run_benchmarks(ws, repeat, selected=None):
+    results = {}
+    for name, setup, func in BENCHMARKS:
+        if selected and name not in selected:
+            continue
+        samples = []
+        for _ in range(repeat):
+            if setup is not None:
+                setup(ws)
+            started = time.perf_counter()
+            func(ws)
+            samples.append(time.perf_counter() - started)
+        results[name] = {"min": min(samples), "median": statistics.median(samples), "max": max(samples)}
+        print(f"{name:<28} median {results[name]['median'] * 1000:10.1f} ms   "
+              f"min {results[name]['min'] * 1000:10.1f} ms", flush=True)
+    return results
+
+def compare_with_baseline(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        limit = max(previous["median"] * tolerance, previous["median"] + NOISE_FLOOR_SECONDS)
+        if result["median"] > limit:
+            regressions.append((name, previous["median"], result["median"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSW 핵심 로직 벤치마크")
+    parser.add_argument("--synthetic", action="store_true", help="번들 데이터 대신 합성 데이터 사용")
+    parser.add_argument("--people", type=int, default=500)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--teams", type=int, default=50)
+    parser.add_argument("--export-teams", type=int, default=7, help="JSON 내보내기 / git 벤치마크에 사용할 팀 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="실행할 벤치마크 이름")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    workspace = tempfile.mkdtemp(prefix="rsw_bench_")
+    try:
+        if args.synthetic:
+            write_synthetic_data(workspace, args.people, args.months, args.teams)
+        else:
+            copy_bundled_data(workspace)
+        ws = Workspace(workspace, args.export_teams)
+        print(f"dataset: {'synthetic' if args.synthetic else 'bundled'} · "
+              f"{len(ws.catalog.teams())} teams · {len(ws.entries)} schedules", flush=True)
+        selected = set(args.only) if args.only else None
+        if selected:
+            # 뒤 단계는 앞 단계 결과(프레임 / 분류 결과 / JSON)를 사용
+            selected |= {"columnar_load", "classify"} | ({"json_export_cold"} if selected & {
+                "json_export_unchanged", "git_batched_commit_push", "git_per_file_commit_push"} else set())
+        results = run_benchmarks(ws, args.repeat, selected)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    report = {
+        "dataset": "synthetic" if args.synthetic else "bundled",
+        "params": vars(args),
+        "generated_at": time.time(),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
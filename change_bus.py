@@ -0,0 +1,186 @@
+import os
+import re
+import threading
+import time
+from collections import deque, namedtuple
+
+# -------------------------------------------------------------------
+# 🔔 변경 알림 버스 (프로세스 내부, (팀, 월, 종류) 단위)
+#   - 파일이 바뀌면 publish → 전역 순번(version)을 1 올리고 최근 이벤트 목록에 기록
+#   - 세션은 자기 (팀, 월) 만 구독하고, 마지막으로 본 순번 이후의 이벤트만 확인
+#     (메모리상의 짧은 목록만 훑으므로 git / 파일을 다시 읽지 않음)
+#   - 팀 전체에 영향을 주는 변경(범례)은 월을 ALL 로 발행
+# -------------------------------------------------------------------
+ALL = "*"
+MAX_EVENTS = 1024
+
+ChangeEvent = namedtuple("ChangeEvent", ["version", "team", "month", "artifact", "at"])
+
+def month_key(year, month):
+    return f"{int(year)}-{int(month):02d}"
+
+def _matches(event, team, month):
+    return (team == ALL or event.team in (ALL, team)) and (month == ALL or event.month in (ALL, month))
+
+class ChangeBus:
+    def __init__(self, max_events=MAX_EVENTS):
+        self.version = 0
+        self._events = deque(maxlen=max_events)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def publish(self, team, month, artifact):
+        with self._lock:
+            self.version += 1
+            event = ChangeEvent(self.version, team, month, artifact, time.time())
+            self._events.append(event)
+            listeners = list(self._listeners)
+        for listener in listeners:  # 프로세스 공용 캐시 (카탈로그 등) 갱신용
+            listener(event)
+        return event
+
+    def add_listener(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def events_since(self, version, keys):
+        # 목록이 넘쳐 잘린 구간이 있으면 None (= 무엇이 바뀌었는지 모르므로 전체 새로고침)
+        with self._lock:
+            if self._events and self._events[0].version > version + 1:
+                return None
+            return [event for event in self._events if event.version > version
+                    and any(_matches(event, team, month) for team, month in keys)]
+
+    def subscribe(self, keys):
+        return Subscription(self, keys)
+
+class Subscription:
+    def __init__(self, bus, keys):
+        self.bus = bus
+        self.keys = tuple(keys)
+        self.seen = bus.version
+
+    def changes(self):
+        # 마지막 확인 이후 구독한 (팀, 월) 에 생긴 이벤트 (None: 전체 새로고침 필요)
+        version = self.bus.version
+        if version == self.seen:
+            return []
+        events = self.bus.events_since(self.seen, self.keys)
+        self.seen = version
+        return events
+
+    def mark_seen(self):
+        # 이 세션이 직접 저장한 변경은 다시 새로고침하지 않음
+        self.seen = self.bus.version
+
+# -------------------------------------------------------------------
+# 👀 파일 감시: 팀 폴더의 (mtime, 크기) 를 주기적으로 비교하여 버스에 발행
+#   - 다른 인스턴스가 푸시한 파일(git pull), 다른 워커 프로세스 / API 서버의 기록도 감지
+#   - 같은 프로세스의 저장은 notify_paths 로 즉시 발행 (다음 주기에 중복 발행되지 않음)
+#   rules: [(종류, 루트 폴더, 파일 이름 → 월 키 / ALL / None(감시 제외))]
+# -------------------------------------------------------------------
+DEFAULT_SCAN_SECONDS = 2.0
+
+def pattern_month(pattern):
+    pattern = re.compile(pattern)
+    def month_of(file_name):
+        match = pattern.match(file_name)
+        return month_key(match.group(1), match.group(2)) if match else None
+    return month_of
+
+def team_wide(suffix):
+    return lambda file_name: ALL if file_name.endswith(suffix) else None
+
+def _fingerprint(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class ChangeWatcher:
+    def __init__(self, bus, rules, scan_seconds=DEFAULT_SCAN_SECONDS):
+        self.bus = bus
+        self.rules = [(artifact, os.path.abspath(root_dir), month_of) for artifact, root_dir, month_of in rules]
+        self.scan_seconds = scan_seconds
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+        self._primed = False
+        self._thread = threading.Thread(target=self._run, name="change-watcher", daemon=True)
+
+    def start(self):
+        self.scan()  # 현재 상태를 기준으로 삼음 (시작 시에는 발행하지 않음)
+        if self.scan_seconds and not self._thread.is_alive():
+            self._thread.start()
+        return self
+
+    def _classify(self, path):
+        path = os.path.abspath(path)
+        for artifact, root_dir, month_of in self.rules:
+            team_dir, file_name = os.path.split(path)
+            if os.path.dirname(team_dir) == root_dir:
+                month = month_of(file_name)
+                if month is not None:
+                    return os.path.basename(team_dir), month, artifact
+        return None
+
+    def _update(self, path, fingerprint):
+        # 지문이 바뀐 경우에만 (팀, 월, 종류) 반환
+        with self._lock:
+            if self._fingerprints.get(path) == fingerprint:
+                return None
+            if fingerprint is None:
+                self._fingerprints.pop(path, None)
+            else:
+                self._fingerprints[path] = fingerprint
+        return self._classify(path)
+
+    def _publish(self, keys):
+        for team, month, artifact in sorted(keys):
+            self.bus.publish(team, month, artifact)
+
+    def notify_paths(self, paths):
+        keys = set()
+        for path in paths:
+            key = self._update(os.path.abspath(path), _fingerprint(path))
+            if key is not None:
+                keys.add(key)
+        self._publish(keys)
+
+    def scan(self):
+        current = {}
+        for _artifact, root_dir, month_of in self.rules:
+            try:
+                team_dirs = [entry for entry in os.scandir(root_dir) if entry.is_dir()]
+            except FileNotFoundError:
+                continue
+            for team_dir in team_dirs:
+                for entry in os.scandir(team_dir.path):
+                    if entry.is_file() and month_of(entry.name) is not None:
+                        stat = entry.stat()
+                        current[os.path.abspath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            previous = self._fingerprints
+            removed = [path for path in previous if path not in current]
+        keys = set()
+        for path, fingerprint in current.items():
+            if previous.get(path) != fingerprint:
+                key = self._update(path, fingerprint)
+                if key is not None:
+                    keys.add(key)
+        for path in removed:
+            key = self._update(path, None)
+            if key is not None:
+                keys.add(key)
+        if self._primed:
+            self._publish(keys)
+        self._primed = True
+
+    def _run(self):
+        while True:
+            time.sleep(self.scan_seconds)
+            try:
+                self.scan()
+            except OSError:
+                continue  # 스캔 중 폴더가 바뀌는 경우 다음 주기에 다시 확인
@@ -0,0 +1,172 @@
+import os
+import re
+import json
+import struct
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import write_bytes_atomic
+
+# -------------------------------------------------------------------
+# 🗜️ 근무표 압축 저장 형식 (.rswc, CSV 옆에 캐시)
+#   [MAGIC 4B][헤더 길이 4B][헤더 JSON][패딩][근무기호 코드 행렬 (rows × days)]
+#   - 근무기호는 코드표(code_table) 인덱스로 저장 (0 = 빈 칸)
+#   - 코드 행렬은 np.memmap 으로 바로 읽어 CSV 파싱 / 문자열 객체 생성 생략
+#   - CSV 는 그대로 원본(다운로드/내보내기)으로 유지
+# -------------------------------------------------------------------
+MAGIC = b"RSWC"
+FORMAT_VERSION = 1
+SIDECAR_SUFFIX = ".rswc"
+DATA_ALIGNMENT = 64
+DAY_COLUMN_PATTERN = re.compile(r"^\s*\d{1,2}\([월화수목금토일]\)")
+
+def sidecar_path(csv_path):
+    return os.path.splitext(csv_path)[0] + SIDECAR_SUFFIX
+
+def _source_info(csv_path, with_hash=True):
+    stat = os.stat(csv_path)
+    info = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        with open(csv_path, "rb") as f:
+            info["sha256"] = hashlib.sha256(f.read()).hexdigest()
+    return info
+
+def _meta_values(series):
+    values = series.tolist()
+    return [None if (isinstance(v, float) and np.isnan(v)) else v for v in values]
+
+# -------------------------------------------------------------------
+# 쓰기: DataFrame → .rswc
+# -------------------------------------------------------------------
+def write_columnar(csv_path, df=None, sha256=None):
+    # sha256: 호출하는 쪽이 이미 가진 CSV 내용 해시 (있으면 파일을 다시 읽지 않음)
+    if df is None:
+        df = pd.read_csv(csv_path)
+
+    code_columns = [col for col in df.columns if DAY_COLUMN_PATTERN.match(str(col))]
+    meta_columns = [col for col in df.columns if col not in code_columns]
+
+    if code_columns:
+        codes_flat, uniques = pd.factorize(df[code_columns].to_numpy(dtype=object).ravel(), use_na_sentinel=True)
+    else:
+        codes_flat, uniques = np.empty(0, dtype=np.int64), []
+    code_table = [str(code) for code in uniques]
+    dtype = np.uint8 if len(code_table) < 255 else np.uint16
+    codes = (codes_flat + 1).astype(dtype).reshape(len(df), len(code_columns))  # 0 = 빈 칸
+
+    header = {
+        "version": FORMAT_VERSION,
+        "source": _source_info(csv_path, with_hash=sha256 is None),
+        "rows": len(df),
+        "column_order": [str(col) for col in df.columns],
+        "meta_columns": [
+            {"name": str(col), "dtype": str(df[col].dtype), "values": _meta_values(df[col])}
+            for col in meta_columns
+        ],
+        "code_columns": [str(col) for col in code_columns],
+        "code_table": code_table,
+        "dtype": np.dtype(dtype).name,
+    }
+    if sha256 is not None:
+        header["source"]["sha256"] = sha256
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_offset = -(-(8 + len(header_bytes)) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+
+    target_path = sidecar_path(csv_path)
+    write_bytes_atomic(target_path, b"".join([
+        MAGIC, struct.pack("<I", len(header_bytes)), header_bytes,
+        b"\0" * (data_offset - 8 - len(header_bytes)),
+        np.ascontiguousarray(codes).tobytes(),
+    ]))
+    return target_path
+
+def remove_columnar(csv_path):
+    try:
+        os.remove(sidecar_path(csv_path))
+    except FileNotFoundError:
+        pass
+
+# -------------------------------------------------------------------
+# 읽기: .rswc → 헤더 + memmap 코드 행렬 (원본 CSV 와 다르면 None)
+# -------------------------------------------------------------------
+def read_columnar(csv_path):
+    path = sidecar_path(csv_path)
+    try:
+        with open(path, "rb") as f:
+            if f.read(4) != MAGIC:
+                return None
+            (header_length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_length).decode("utf-8"))
+    except (FileNotFoundError, struct.error, ValueError):
+        return None
+
+    if header.get("version") != FORMAT_VERSION:
+        return None
+    source = header["source"]
+    try:
+        current = _source_info(csv_path, with_hash=False)
+    except FileNotFoundError:
+        return None
+    if (current["size"], current["mtime_ns"]) != (source["size"], source["mtime_ns"]):
+        # git clone / pull 등으로 mtime 만 바뀐 경우 내용 해시로 재확인
+        if current["size"] != source["size"] or _source_info(csv_path)["sha256"] != source["sha256"]:
+            return None
+        # 내용이 같으면 헤더의 mtime 을 갱신하여 다음 로드부터는 다시 해시하지 않음
+        header_length = _refresh_source(path, header, header_length, current)
+
+    shape = (header["rows"], len(header["code_columns"]))
+    data_offset = -(-(8 + header_length) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+    if shape[0] * shape[1] == 0:
+        codes = np.zeros(shape, dtype=header["dtype"])
+    else:
+        codes = np.memmap(path, dtype=header["dtype"], mode="r", offset=data_offset, shape=shape)
+    return header, codes
+
+def _refresh_source(path, header, header_length, current):
+    old_offset = -(-(8 + header_length) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+    header["source"] = dict(header["source"], size=current["size"], mtime_ns=current["mtime_ns"])
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_offset = -(-(8 + len(header_bytes)) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+    try:
+        with open(path, "rb") as f:
+            f.seek(old_offset)
+            code_bytes = f.read()
+        write_bytes_atomic(path, b"".join([
+            MAGIC, struct.pack("<I", len(header_bytes)), header_bytes,
+            b"\0" * (data_offset - 8 - len(header_bytes)),
+            code_bytes,
+        ]))
+    except OSError:
+        return header_length  # 읽기 전용 환경에서는 기존 파일 그대로 사용 (다음에도 해시로 확인)
+    return len(header_bytes)
+
+def columnar_to_frame(header, codes):
+    # 근무기호 열은 코드표 하나를 공유하는 Categorical 로 구성 (문자열 객체 생성 없음)
+    dtype = pd.CategoricalDtype(pd.Index(header["code_table"], dtype=object))
+    code_index = codes.astype(np.int16) - 1  # 0(빈 칸) → -1(NaN)
+    columns = {}
+    for meta in header["meta_columns"]:
+        values = meta["values"]
+        if meta["dtype"] == "object":
+            values = [np.nan if v is None else v for v in values]
+        columns[meta["name"]] = pd.Series(values, dtype=meta["dtype"])
+    for index, name in enumerate(header["code_columns"]):
+        columns[name] = pd.Categorical.from_codes(code_index[:, index], dtype=dtype, validate=False)
+    return pd.DataFrame({name: columns[name] for name in header["column_order"]})
+
+# -------------------------------------------------------------------
+# 근무표 로더: .rswc 가 최신이면 바로 사용, 아니면 CSV 파싱 후 .rswc 생성
+# -------------------------------------------------------------------
+def load_schedule_frame(csv_path):
+    columnar = read_columnar(csv_path)
+    if columnar is not None:
+        return columnar_to_frame(*columnar)
+
+    df = pd.read_csv(csv_path)
+    try:
+        write_columnar(csv_path, df)
+    except OSError:
+        pass  # 읽기 전용 환경에서는 CSV 만 사용
+    return df
@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+
+from atomic_io import write_bytes_atomic, write_json_atomic
+from schedule_engine import build_day_schedule
+
+# -------------------------------------------------------------------
+# 📦 일별 JSON 산출물 (team_today_schedules/<팀>/<YYYY-MM>/<YYYY-MM-DD>_schedule.json)
+#   - 매니페스트(원본 CSV / 범례 지문 + 포맷 버전)가 같으면 재생성 생략
+#   - 내용이 바뀐 파일만 다시 쓰고 변경 목록을 반환 (커밋은 호출하는 쪽에서)
+# -------------------------------------------------------------------
+EXPORT_FORMAT_VERSION = 2  # 2: 범례 컴파일 (접미 변형 / 와일드카드 근무기호 분류)
+EXPORT_MANIFEST_NAME = "_manifest.json"
+_fingerprint_cache = {}
+
+def file_fingerprint(file_path):
+    # (mtime, size)가 같으면 이전 해시를 재사용하여 파일을 다시 읽지 않음
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    cache_key = (file_path, stat.st_mtime_ns, stat.st_size)
+    cached = _fingerprint_cache.get(file_path)
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    with open(file_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _fingerprint_cache[file_path] = (cache_key, digest)
+    return digest
+
+def build_export_key(schedule_path, model_path):
+    return {
+        "format_version": EXPORT_FORMAT_VERSION,
+        "schedule": file_fingerprint(schedule_path),
+        "model_example": file_fingerprint(model_path),
+    }
+
+def get_export_manifest_path(month_folder):
+    return os.path.join(month_folder, EXPORT_MANIFEST_NAME)
+
+def load_export_manifest(manifest_path):
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def needs_export(manifest_path, export_key):
+    return load_export_manifest(manifest_path) != export_key
+
+def save_export_manifest(manifest_path, export_key):
+    write_json_atomic(manifest_path, export_key)
+
+def day_json_path(today_team_folder_path, date):
+    month_folder = os.path.join(today_team_folder_path, date.strftime('%Y-%m'))
+    return os.path.join(month_folder, f"{date.strftime('%Y-%m-%d')}_schedule.json")
+
+def export_month_json(date_list, today_team_folder_path, shift_matrix, export_key=None, manifest_date=None):
+    # date_list 는 월 전체 또는 재업로드로 바뀐 날짜만 (manifest_date: 매니페스트를 둘 월의 아무 날짜)
+    changed_files = []
+    for date in date_list:
+        json_file_path = day_json_path(today_team_folder_path, date)
+
+        # 해당 날짜 열이 없으면 빈 목록으로 저장
+        schedule_data = build_day_schedule(shift_matrix, date)
+
+        # 내용이 바뀐 파일만 다시 쓰고 커밋 대상에 포함
+        new_content = json.dumps(schedule_data, ensure_ascii=False, indent=4).encode("utf-8")
+        try:
+            with open(json_file_path, "rb") as json_file:
+                if json_file.read() == new_content:
+                    continue
+        except FileNotFoundError:
+            pass
+        write_bytes_atomic(json_file_path, new_content) # 💾 읽는 쪽은 항상 완성된 파일만 봄
+        changed_files.append(json_file_path)
+
+    # 매니페스트도 같은 커밋에 포함하여 다른 인스턴스도 재생성을 건너뛰도록 함
+    manifest_date = manifest_date or (date_list[0] if date_list else None)
+    if export_key is not None and manifest_date is not None:
+        manifest_path = get_export_manifest_path(
+            os.path.join(today_team_folder_path, manifest_date.strftime('%Y-%m')))
+        save_export_manifest(manifest_path, export_key)
+        changed_files.append(manifest_path)
+    return changed_files
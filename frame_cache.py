@@ -0,0 +1,94 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# -------------------------------------------------------------------
+# 파일 지문: (mtime, size) - 파일 내용을 읽지 않고 변경 여부 판단
+# -------------------------------------------------------------------
+def stat_fingerprint(file_path):
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+# -------------------------------------------------------------------
+# 🚀 팀 / 종류 / 월 단위 DataFrame 캐시 (LRU, 크기 제한)
+#   - 키: (team, kind, month) + 파일 지문
+#   - 파일이 바뀐 항목만 다시 읽고, 나머지 팀/월 캐시는 그대로 유지
+#   - 반환되는 DataFrame 은 모든 세션이 공유하므로 수정하지 말 것
+# -------------------------------------------------------------------
+class FrameCache:
+    def __init__(self, max_entries=64, loader=None):
+        self.max_entries = max_entries
+        self.loader = loader or pd.read_csv
+        self._entries = OrderedDict()  # (team, kind, month) -> (file_path, fingerprint, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, file_path, team=None, kind=None, month=None, loader=None):
+        slot = (team, kind, month) if (team, kind, month) != (None, None, None) else (file_path,)
+        try:
+            fingerprint = stat_fingerprint(file_path)
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(slot, None)
+            raise
+
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] == file_path and entry[1] == fingerprint:
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        value = (loader or self.loader)(file_path)
+
+        with self._lock:
+            self._entries[slot] = (file_path, fingerprint, value)
+            self._entries.move_to_end(slot)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, file_path=None, team=None, kind=None):
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if file_path is not None and entry[0] != file_path:
+                    continue
+                if team is not None and key[0] != team:
+                    continue
+                if kind is not None and key[1:2] != (kind,):
+                    continue
+                del self._entries[key]
+
+    def prune(self):
+        # git pull 등 외부 변경 후: 파일이 바뀌었거나 사라진 항목만 제거
+        with self._lock:
+            items = list(self._entries.items())
+        stale = []
+        for key, (file_path, fingerprint, _value) in items:
+            try:
+                if stat_fingerprint(file_path) != fingerprint:
+                    stale.append(key)
+            except FileNotFoundError:
+                stale.append(key)
+        with self._lock:
+            for key in stale:
+                self._entries.pop(key, None)
+        return len(stale)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
@@ -0,0 +1,287 @@
+import os
+import json
+import queue
+import socket
+import threading
+import time
+from git import Repo
+
+from atomic_io import FileLock, write_text_atomic
+from perf_metrics import registry as perf_registry, timed
+
+# -------------------------------------------------------------------
+# 🔒 저장소 잠금: 커밋 / 푸시 / 풀을 스레드 + 프로세스(Streamlit 워커) 간 직렬화
+#   - flock 기반이라 잠금을 가진 프로세스가 죽으면 자동으로 해제됨
+#   - 잠금 보유자 정보(PID, 호스트, 획득 시각)는 .git/rsw-sync.owner 에 기록
+#   - git 이 남긴 .git/index.lock 은 오래된(stale) 경우에만 제거하고,
+#     최근 것이면 다른 git 명령이 끝날 때까지 기다림
+# -------------------------------------------------------------------
+INDEX_LOCK_STALE_SECONDS = 300
+INDEX_LOCK_WAIT_SECONDS = 30
+
+class GitLockTimeout(RuntimeError):
+    pass
+
+class RepoLock:
+    def __init__(self, repo_root, index_lock_stale_seconds=INDEX_LOCK_STALE_SECONDS,
+                 index_lock_wait_seconds=INDEX_LOCK_WAIT_SECONDS):
+        self.git_dir = os.path.join(repo_root, ".git")
+        self.owner_path = os.path.join(self.git_dir, "rsw-sync.owner")
+        self.index_lock_path = os.path.join(self.git_dir, "index.lock")
+        self.index_lock_stale_seconds = index_lock_stale_seconds
+        self.index_lock_wait_seconds = index_lock_wait_seconds
+        self._file_lock = FileLock(os.path.join(self.git_dir, "rsw-sync"))
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "lock_acquisitions": 0,
+            "lock_wait_last": 0.0,
+            "lock_wait_max": 0.0,
+            "lock_wait_total": 0.0,
+            "stale_locks_removed": 0,
+        }
+
+    def __enter__(self):
+        started = time.monotonic()
+        self._file_lock.__enter__()
+        try:
+            self._wait_for_index_lock()
+            self._record_wait(time.monotonic() - started)
+            write_text_atomic(self.owner_path, json.dumps(
+                {"pid": os.getpid(), "host": socket.gethostname(), "acquired_at": time.time()}))
+        except BaseException:
+            self._file_lock.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.owner_path)
+        except FileNotFoundError:
+            pass
+        self._file_lock.__exit__(*exc)
+
+    def _wait_for_index_lock(self):
+        deadline = time.monotonic() + self.index_lock_wait_seconds
+        while True:
+            try:
+                age = time.time() - os.stat(self.index_lock_path).st_mtime
+            except FileNotFoundError:
+                return
+            if age >= self.index_lock_stale_seconds:
+                # 오래 방치된 잠금 (비정상 종료된 git 명령) 만 제거
+                try:
+                    os.remove(self.index_lock_path)
+                    with self._stats_lock:
+                        self._stats["stale_locks_removed"] += 1
+                except FileNotFoundError:
+                    pass
+                return
+            if time.monotonic() >= deadline:
+                raise GitLockTimeout(f"다른 git 작업이 진행 중입니다 (index.lock {age:.0f}초 경과)")
+            time.sleep(0.2)
+
+    def _record_wait(self, waited):
+        perf_registry.record("git.lock_wait", waited * 1000)  # /metrics 에서 git.commit / push / pull 과 함께 p50 / p95
+        with self._stats_lock:
+            self._stats["lock_acquisitions"] += 1
+            self._stats["lock_wait_last"] = waited
+            self._stats["lock_wait_max"] = max(self._stats["lock_wait_max"], waited)
+            self._stats["lock_wait_total"] += waited
+
+    def owner(self):
+        try:
+            with open(self.owner_path, "r", encoding="utf-8") as f:
+                owner = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        owner["age"] = time.time() - owner["acquired_at"]
+        return owner
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+_repo_locks = {}
+_repo_locks_guard = threading.Lock()
+
+def repo_lock(repo_root):
+    repo_root = os.path.abspath(repo_root)
+    with _repo_locks_guard:
+        if repo_root not in _repo_locks:
+            _repo_locks[repo_root] = RepoLock(repo_root)
+        return _repo_locks[repo_root]
+
+# -------------------------------------------------------------------
+# 여러 파일을 한 번에 스테이징하고 커밋 1회 (변경 없으면 커밋 생략)
+# -------------------------------------------------------------------
+@timed("git.commit")
+def commit_files(repo, file_paths, commit_message):
+    repo_root = repo.working_tree_dir
+    with repo_lock(repo_root):
+        to_add = []
+        to_remove = []
+        for file_path in file_paths:
+            relative_path = os.path.relpath(os.path.abspath(file_path), repo_root)
+            if os.path.exists(file_path):
+                to_add.append(relative_path)
+            else:
+                to_remove.append(relative_path)
+
+        if to_add:
+            repo.index.add(to_add)
+        if to_remove:
+            tracked = {path for (path, _stage) in repo.index.entries}
+            to_remove = [path for path in to_remove if path.replace(os.sep, "/") in tracked]
+            if to_remove:
+                repo.index.remove(to_remove)
+
+        # 변경된 파일이 하나도 없으면 커밋 생략
+        if repo.head.is_valid() and not repo.index.diff(repo.head.commit):
+            return False
+
+        repo.index.commit(commit_message)
+        repo.git.branch("-M", "main")
+        return True
+
+@timed("git.push")
+def push_changes(repo, remote_url):
+    with repo_lock(repo.working_tree_dir):
+        origin = repo.remote(name="origin")
+        origin.set_url(remote_url)
+        origin.push("HEAD:refs/heads/main")
+
+@timed("git.pull")
+def pull_changes(repo, remote_url):
+    with repo_lock(repo.working_tree_dir):
+        origin = repo.remote(name="origin")
+        origin.set_url(remote_url)
+        origin.pull("main")
+
+# -------------------------------------------------------------------
+# 🚀 백그라운드 Git 동기화 워커
+#   - 요청은 큐에 넣고 즉시 반환
+#   - 짧은 시간 동안 몰린 커밋은 모아서 푸시 1회로 처리
+#   - 푸시 실패 시 지수 백오프로 재시도, 상태는 status() 로 조회
+# -------------------------------------------------------------------
+class GitSyncWorker:
+    def __init__(self, repo, remote_url, coalesce_seconds=2.0,
+                 max_retries=5, backoff_seconds=1.0, max_backoff_seconds=60.0):
+        self.repo = repo if isinstance(repo, Repo) else Repo(repo)
+        self.remote_url = remote_url
+        self.coalesce_seconds = coalesce_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._queue = queue.Queue()
+        self._status_lock = threading.Lock()
+        self._status = {
+            "pending_commits": 0,
+            "last_commit_at": None,
+            "last_push_at": None,
+            "last_pull_at": None,
+            "last_error": None,
+            "last_error_at": None,
+            "busy": False,
+        }
+        self._thread = threading.Thread(target=self._run, name="git-sync-worker", daemon=True)
+
+    def start(self):
+        if not self._thread.is_alive():
+            self._thread.start()
+        return self
+
+    def submit_commit(self, file_paths, commit_message, push=False):
+        if file_paths:
+            self._queue.put(("commit", list(file_paths), commit_message, push))
+
+    def request_push(self):
+        self._queue.put(("push",))
+
+    def request_pull(self, on_complete=None):
+        self._queue.put(("pull", on_complete))
+
+    def status(self):
+        with self._status_lock:
+            status = dict(self._status)
+        status["queued"] = self._queue.qsize()
+        lock = repo_lock(self.repo.working_tree_dir)
+        status.update(lock.stats())
+        status["lock_owner"] = lock.owner()
+        return status
+
+    def _update_status(self, **values):
+        with self._status_lock:
+            self._status.update(values)
+
+    def _record_error(self, error):
+        self._update_status(last_error=str(error), last_error_at=time.time())
+
+    def _run(self):
+        while True:
+            jobs = [self._queue.get()]
+            # 짧은 시간 동안 추가로 들어온 요청을 한 번에 처리
+            deadline = time.monotonic() + self.coalesce_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    jobs.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._update_status(busy=True)
+            try:
+                self._process(jobs)
+            finally:
+                self._update_status(busy=False)
+
+    def _process(self, jobs):
+        want_push = False
+        pull_callbacks = []
+        want_pull = False
+
+        for job in jobs:
+            if job[0] == "commit":
+                _, file_paths, commit_message, push = job
+                try:
+                    if commit_files(self.repo, file_paths, commit_message):
+                        with self._status_lock:
+                            self._status["pending_commits"] += 1
+                            self._status["last_commit_at"] = time.time()
+                except Exception as e:
+                    self._record_error(e)
+                want_push = want_push or push
+            elif job[0] == "push":
+                want_push = True
+            elif job[0] == "pull":
+                want_pull = True
+                if job[1] is not None:
+                    pull_callbacks.append(job[1])
+
+        if want_push:
+            self._push_with_retry()
+
+        if want_pull:
+            try:
+                pull_changes(self.repo, self.remote_url)
+                self._update_status(last_pull_at=time.time())
+            except Exception as e:
+                self._record_error(e)
+            for callback in pull_callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    self._record_error(e)
+
+    def _push_with_retry(self):
+        for attempt in range(self.max_retries):
+            try:
+                push_changes(self.repo, self.remote_url)
+                self._update_status(pending_commits=0, last_push_at=time.time(), last_error=None)
+                return True
+            except Exception as e:
+                self._record_error(e)
+                if attempt + 1 < self.max_retries:
+                    time.sleep(min(self.backoff_seconds * (2 ** attempt), self.max_backoff_seconds))
+        return False
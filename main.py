@@ -1,29 +1,41 @@
 import os
 import streamlit as st
 import pandas as pd
-from io import BytesIO
+import altair as alt
 from datetime import timedelta, datetime
 import time
 import pytz
 import json
-from collections import defaultdict
 from urllib.parse import unquote
-from cryptography.fernet import Fernet
-from git import Repo, GitCommandError
-import subprocess
+from git import Repo
+from git_sync import GitSyncWorker, repo_lock
+from frame_cache import FrameCache
+from columnar_store import load_schedule_frame, remove_columnar
+from upload_ingest import UploadError, ingest_schedule, ingest_legend
+import memo_store
+from atomic_io import write_bytes_atomic, write_text_atomic
+from perf_metrics import registry as perf_registry, timer, timed
+from daily_export import (
+    file_fingerprint, build_export_key, get_export_manifest_path, needs_export, export_month_json,
+)
+from schedule_catalog import SCHEDULE_FILE_PATTERN, ScheduleCatalog, model_example_path
+from change_bus import ALL, ChangeBus, ChangeWatcher, month_key, pattern_month, team_wide
+from person_index import PersonIndex
+from schedule_engine import (
+    SHIFT_DAY, SHIFT_NIGHT, SHIFT_VACATION,
+    compile_legend, build_shift_matrix, shift_board, day_column_label, normalize_day_columns,
+)
+from staffing_coverage import COVERAGE_KINDS, TEAM_TOTAL, month_coverage, coverage_report, coverage_summary, coverage_gaps
+from schedule_diff import diff_schedules, changelog_path, changelog_entries, append_changelog, load_changelog, query_changelog
+from range_export import LAYOUTS, FORMATS, ExportError, validate_export, export_file_name, export_range
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from functools import partial
 
 os.environ["GIT_OPTIONAL_LOCKS"] = "0" #index.lock 파일 관련 오류 해지
-git_lock = threading.Lock()
+rerun_started = time.perf_counter() # ⏱️ 재실행 1회 전체 소요 시간 측정용
 
-# -------------------------------------------------------------------
-# Git 사용자 정보 강제 재설정 함수
-# -------------------------------------------------------------------
-def reset_git_config():
-    subprocess.run(['git', 'config', '--global', 'user.name', st.secrets["GITHUB"]["USER_NAME"]])
-    subprocess.run(['git', 'config', '--global', 'user.email', st.secrets["GITHUB"]["USER_EMAIL"]])
-
-reset_git_config()
 # -------------------------------------------------------------------
 # 기본 설정
 # -------------------------------------------------------------------
@@ -35,6 +47,13 @@ schedules_root_dir = "team_schedules"
 model_example_root_dir = "team_model_example"
 today_schedules_root_dir = "team_today_schedules"
 memo_root_dir = "team_memo"
+changelog_root_dir = "team_changelog"
+root_dirs = [schedules_root_dir, model_example_root_dir, today_schedules_root_dir, memo_root_dir, changelog_root_dir]
+
+# 🔔 다른 세션 / 인스턴스의 변경 반영 주기 (초, 0 이면 끔)
+LIVE_REFRESH_SECONDS = float(os.environ.get("RSW_LIVE_REFRESH_SECONDS", "3"))
+CHANGE_SCAN_SECONDS = float(os.environ.get("RSW_CHANGE_SCAN_SECONDS", "2"))
+CHANGE_LABELS = {"schedule": "근무표", "legend": "범례", "memo": "메모", "changelog": "변경 이력"}
 
 # -------------------------------------------------------------------
 # 디렉토리 생성 함수: 파일 경로가 없으면 생성
@@ -43,12 +62,7 @@ def create_dir_safe(path):
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
         # 빈 폴더도 Git에 반영되도록 .gitkeep 파일 생성
-        gitkeep_path = os.path.join(path, ".gitkeep")
-        with open(gitkeep_path, "w") as f:
-            f.write("")
-
-for folder in [schedules_root_dir, model_example_root_dir, today_schedules_root_dir, memo_root_dir]:
-    create_dir_safe(folder)
+        write_bytes_atomic(os.path.join(path, ".gitkeep"), b"")
 
 # -------------------------------------------------------------------
 # Personal Access Token(PAT)가 포함된 인증 URL 생성 함수
@@ -66,9 +80,6 @@ def build_auth_repo_url():
 # 1) Git 저장소 초기화 및 원격 연결 (GitPython, PAT 적용)
 # -------------------------------------------------------------------
 def git_init_repo():
-    for folder in [schedules_root_dir, model_example_root_dir, today_schedules_root_dir, memo_root_dir]:
-        create_dir_safe(folder)
-    
     if not os.path.exists(os.path.join(repo_root, ".git")):
         repo = Repo.init(repo_root, initial_branch="main")
         auth_repo_url = build_auth_repo_url()
@@ -79,89 +90,289 @@ def git_init_repo():
             config.set_value("user", "email", st.secrets["GITHUB"]["USER_EMAIL"])
         
         gitignore_path = os.path.join(repo_root, ".gitignore")
-        with open(gitignore_path, "w") as f:
-            f.write("team_today_schedules/\nteam_memo/\n*.tmp\n")
+        write_text_atomic(gitignore_path, "team_today_schedules/\nteam_memo/\n*.tmp\n")
         
         repo.index.add([gitignore_path])
         repo.index.commit("Initial commit with .gitignore")
         repo.git.branch("-M", "main")
 
 # -------------------------------------------------------------------
-# 🔥 추가: 엉켜있는 Git 자물쇠(lock) 파일 강제 제거 함수
+# 🚀 프로세스 부트스트랩: 최초 1회만 실행하고 모든 세션/재실행이 공유
+#    (폴더 생성, 저장소 열기, Git 사용자 정보, 인증 URL, 동기화 워커)
 # -------------------------------------------------------------------
-def remove_stale_git_lock():
-    lock_path = os.path.join(repo_root, ".git", "index.lock")
-    if os.path.exists(lock_path):
-        try:
-            os.remove(lock_path)
-        except Exception:
-            pass
+@st.cache_resource
+def bootstrap():
+    for folder in root_dirs:
+        create_dir_safe(folder)
+    git_init_repo()
+
+    repo = Repo(repo_root)
+    git_identity = {
+        "name": st.secrets["GITHUB"]["USER_NAME"],
+        "email": st.secrets["GITHUB"]["USER_EMAIL"],
+    }
+    # Git 사용자 정보 강제 재설정 (subprocess 대신 저장소 설정에 1회 기록)
+    with repo_lock(repo_root), repo.config_writer() as config:
+        config.set_value("user", "name", git_identity["name"])
+        config.set_value("user", "email", git_identity["email"])
+
+    auth_repo_url = build_auth_repo_url()
+    catalog = ScheduleCatalog(schedules_root_dir)
+    catalog.refresh()
+    # 🔔 파일 변경 → (팀, 월, 종류) 알림 (다른 인스턴스 / 프로세스가 쓴 파일은 주기적 스캔으로 감지)
+    change_bus = ChangeBus()
+    change_bus.add_listener(lambda event: catalog.refresh_if_changed() if event.artifact == "schedule" else None)
+    change_watcher = ChangeWatcher(change_bus, [
+        ("schedule", schedules_root_dir, pattern_month(SCHEDULE_FILE_PATTERN.pattern)),
+        ("legend", model_example_root_dir, team_wide("_model_example.csv")),
+        ("memo", memo_root_dir, pattern_month(r"^(\d{4})_(\d{1,2})월_memos\.jsonl?$")),
+        ("changelog", changelog_root_dir, pattern_month(r"^(\d{4})-(\d{2})_changelog\.jsonl$")),
+    ], scan_seconds=CHANGE_SCAN_SECONDS).start()
+    return {
+        "repo": repo,
+        "auth_repo_url": auth_repo_url,
+        "git_identity": git_identity,
+        # 커밋 직후 자동 푸시 여부 (secrets GITHUB.AUTO_PUSH, 기본값: 수동 동기화 시에만 푸시)
+        "auto_push": bool(st.secrets["GITHUB"].get("AUTO_PUSH", False)),
+        "dirs": {
+            "schedules": schedules_root_dir,
+            "model_example": model_example_root_dir,
+            "today_schedules": today_schedules_root_dir,
+            "memo": memo_root_dir,
+            "changelog": changelog_root_dir,
+        },
+        "sync_worker": GitSyncWorker(repo, auth_repo_url).start(),
+        "frame_cache": FrameCache(max_entries=64),
+        "catalog": catalog,
+        "person_index": PersonIndex(catalog),
+        "change_bus": change_bus,
+        "change_watcher": change_watcher,
+    }
+
+def get_sync_worker():
+    return bootstrap()["sync_worker"]
+
+def get_frame_cache():
+    return bootstrap()["frame_cache"]
+
+def get_catalog():
+    return bootstrap()["catalog"]
+
+def get_change_bus():
+    return bootstrap()["change_bus"]
+
+# 이 프로세스에서 저장한 파일을 즉시 알리고, 저장한 세션 자신은 다시 새로고침하지 않음
+def publish_changes(file_paths):
+    bootstrap()["change_watcher"].notify_paths(file_paths)
+    subscription = st.session_state.get("change_subscription")
+    if subscription is not None:
+        subscription.mark_seen()
+
+def get_person_index():
+    person_index = bootstrap()["person_index"]
+    # 바뀐 월만 다시 읽음 (변경 없으면 파일 stat 만 수행)
+    person_index.refresh(
+        load_person_month_matrix,
+        legend_fingerprint=lambda team: file_fingerprint(model_example_path(model_example_root_dir, team)))
+    return person_index
+
+@st.cache_resource
+def ensure_team_dirs(team):
+    for folder in root_dirs:
+        create_dir_safe(os.path.join(folder, team))
+    return True
 
 # -------------------------------------------------------------------
 # 2) 변경사항 자동 커밋 및 푸시 함수
+#    - 커밋/푸시는 워커 큐에 넣고 즉시 반환 (네트워크 대기 없음)
+#    - 여러 파일은 커밋 1회로 묶어서 처리, 내용 변화가 없으면 커밋 생략
+#    - GITHUB.AUTO_PUSH 가 켜져 있으면 짧은 시간 동안 몰린 커밋을 모아 푸시 1회 (꺼져 있으면 수동 동기화 시에만)
 # -------------------------------------------------------------------
-def git_auto_commit(file_path, team_name):
+def git_commit_files(file_paths, team_name):
+    if not file_paths:
+        return
     commit_message = f"Auto-commit: {team_name} {datetime.now(korea_tz).strftime('%Y-%m-%d %H:%M')}"
-    try:
-        with git_lock:
-            remove_stale_git_lock() # 👈 락 강제 해제
-            
-            repo = Repo(repo_root)
-            relative_path = os.path.relpath(file_path, repo_root)
-            
-            if os.path.exists(file_path):
-                repo.index.add([relative_path])
-            else:
-                repo.index.remove([relative_path])
-                
-            repo.index.commit(commit_message)
-            repo.git.branch("-M", "main")
-            origin = repo.remote(name='origin')
-            origin.set_url(build_auth_repo_url())
-            
-            if st.session_state.get("auto_sync_enabled", False):
-                origin.push("HEAD:refs/heads/main")
-                
-    except GitCommandError as e:
-        st.error(f"Git 작업 오류: {e}")
-    except Exception as e:
-        st.error(f"시스템 오류 발생: {e}")
+    get_sync_worker().submit_commit(file_paths, commit_message, push=bootstrap()["auto_push"])
+
+def git_auto_commit(file_path, team_name):
+    git_commit_files([file_path], team_name)
 
 # -------------------------------------------------------------------
-# 3) 원격 저장소의 최신 변경사항 동기화 (pull, push)
+# 3) 원격 저장소의 최신 변경사항 동기화 (pull, push) - 백그라운드 처리
 # -------------------------------------------------------------------
-def git_pull_changes():
-    try:
-        with git_lock: # 👈 동시 접근 방지 및 락 해제 적용
-            remove_stale_git_lock()
-            repo = Repo(repo_root)
-            origin = repo.remote(name='origin')
-            origin.set_url(build_auth_repo_url())
-            origin.pull("main")
-    except GitCommandError as e:
-        st.error(f"Git 동기화 오류: {e}")
+def git_pull_changes(on_complete=None):
+    get_sync_worker().request_pull(on_complete=on_complete)
 
 def git_push_changes():
-    try:
-        with git_lock: # 👈 동시 접근 방지 및 락 해제 적용
-            remove_stale_git_lock()
-            repo = Repo(repo_root)
-            origin = repo.remote(name="origin")
-            origin.set_url(build_auth_repo_url())
-            origin.push("HEAD:refs/heads/main")
-    except GitCommandError as e:
-        st.error(f"Git push 오류: {e}")
-
-if 'git_initialized' not in st.session_state:
-    git_init_repo()
-    st.session_state.git_initialized = True
+    get_sync_worker().request_push()
+
+def format_sync_time(timestamp):
+    if timestamp is None:
+        return "-"
+    return datetime.fromtimestamp(timestamp, korea_tz).strftime('%Y-%m-%d %H:%M:%S')
+
+bootstrap()
 
 # -------------------------------------------------------------------
 # ✨ 데이터 로딩 캐싱 함수 추가 (속도 최적화의 핵심)
+#    (팀, 종류, 월) 단위로 캐싱하여 바뀐 파일만 다시 읽음
+#    근무표는 압축 저장(.rswc)이 최신이면 CSV 파싱 없이 바로 로드
+# -------------------------------------------------------------------
+@timed("load_csv_data")
+def load_csv_data(file_path, team=None, kind=None, month=None):
+    loader = load_schedule_frame if kind == "schedule" else None
+    return get_frame_cache().get(file_path, team=team, kind=kind, month=month, loader=loader)
+
+# -------------------------------------------------------------------
+# 📐 근무표 헤더 정규화 결과 (날짜 → 열 이름) 를 DataFrame 과 같은 지문으로 캐싱
 # -------------------------------------------------------------------
-@st.cache_data
-def load_csv_data(file_path):
-    return pd.read_csv(file_path)
+def load_schedule_schema(file_path, team, year, month):
+    cache_month = f"{year}-{month:02d}"
+    return get_frame_cache().get(
+        file_path, team=team, kind="schedule_schema", month=cache_month,
+        loader=lambda path: normalize_day_columns(load_csv_data(path, team, "schedule", cache_month).columns, year, month))
+
+# -------------------------------------------------------------------
+# 📖 범례는 파일 버전마다 한 번만 컴파일하여 모든 월 / 세션이 공유
+# -------------------------------------------------------------------
+def load_legend(model_path, team):
+    return get_frame_cache().get(
+        model_path, team=team, kind="legend",
+        loader=lambda path: compile_legend(load_csv_data(path, team, "model_example")))
+
+# -------------------------------------------------------------------
+# 🚀 월 전체 근무 분류 결과 캐싱 (파일 지문이 바뀌면 자동으로 새로 계산)
+# -------------------------------------------------------------------
+@st.cache_resource(max_entries=64)
+def load_shift_matrix(team, schedule_path, model_path, year, month, schedule_fingerprint, model_fingerprint):
+    df_schedule = load_csv_data(schedule_path, team, "schedule", f"{year}-{month:02d}")
+    return build_shift_matrix(df_schedule, load_legend(model_path, team),
+                              load_schedule_schema(schedule_path, team, year, month))
+
+def load_person_month_matrix(team, year, month, schedule_path):
+    model_path = model_example_path(model_example_root_dir, team)
+    return load_shift_matrix(team, schedule_path, model_path, year, month,
+                             file_fingerprint(schedule_path), file_fingerprint(model_path))
+
+# -------------------------------------------------------------------
+# 🏢 전체 팀 근무 현황: 모든 팀 근무표/범례를 스레드 풀로 동시에 로드
+#    (캐싱된 DataFrame / 근무 분류 결과 재사용 → 가장 느린 팀 1개 수준의 지연)
+# -------------------------------------------------------------------
+def load_team_day_matrix(team, date):
+    schedule_path = get_catalog().resolve_date(team, date)
+    model_path = model_example_path(model_example_root_dir, team)
+    if not schedule_path or not os.path.exists(model_path):
+        return None
+    matrix = load_shift_matrix(team, schedule_path, model_path, date.year, date.month,
+                               file_fingerprint(schedule_path), file_fingerprint(model_path))
+    return matrix if matrix.has_date(date) else None
+
+@timed("render_shift_table")
+def render_shift_table(title, frame, empty_message):
+    st.write(title)
+    if frame.empty:
+        st.write(empty_message)
+    else:
+        st.dataframe(frame, hide_index=True, use_container_width=True)
+
+# 스레드 풀 작업자에도 현재 세션 실행 컨텍스트를 붙여서 캐시 함수 / bootstrap() 호출 시 경고가 나지 않도록 함
+def map_in_script_threads(func, items, max_workers):
+    ctx = get_script_run_ctx()
+    def run(item):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return func(item)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run, items))
+
+def load_all_teams_board(team_names, date):
+    def load(team):
+        try:
+            return load_team_day_matrix(team, date)
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    matrices = dict(zip(team_names, map_in_script_threads(load, team_names, len(team_names))))
+
+    board = {}
+    for kind in (SHIFT_DAY, SHIFT_NIGHT, SHIFT_VACATION):
+        frames = [shift_board(matrix, date, kind).assign(팀=team)
+                  for team, matrix in matrices.items() if matrix is not None]
+        if not frames:
+            board[kind] = pd.DataFrame(columns=["팀", "파트", "이름", "근무"])
+            continue
+        board[kind] = pd.concat(frames, ignore_index=True)[["팀", "파트", "이름", "근무"]]
+    missing_teams = [team for team, matrix in matrices.items() if matrix is None]
+    return board, missing_teams
+
+# -------------------------------------------------------------------
+# 📈 근무 인원 분석: 월 단위 집계를 입력 지문별로 캐싱
+#    연간 보고서는 캐싱된 월 결과를 합치기만 하므로 재실행 시 바로 표시
+# -------------------------------------------------------------------
+@st.cache_resource(max_entries=512)
+def load_month_coverage(team, schedule_path, model_path, year, month, schedule_fingerprint, model_fingerprint):
+    matrix = load_shift_matrix(team, schedule_path, model_path, year, month, schedule_fingerprint, model_fingerprint)
+    return month_coverage(matrix, team)
+
+def coverage_sources(team_names, year, month=None):
+    sources = []
+    for team in team_names:
+        model_path = model_example_path(model_example_root_dir, team)
+        if not os.path.exists(model_path):
+            continue
+        for source_month in ([month] if month else get_catalog().months(team, year)):
+            schedule_path = get_catalog().path_for(team, year, source_month)
+            if schedule_path:
+                sources.append((team, schedule_path, model_path, year, source_month,
+                                file_fingerprint(schedule_path), file_fingerprint(model_path)))
+    return tuple(sources)
+
+@st.cache_resource(max_entries=16)
+def load_coverage_report(sources):
+    # sources 에 파일 지문이 들어 있으므로 입력이 바뀌면 새 키로 다시 집계 (바뀐 월만 재계산)
+    def load(source):
+        try:
+            return load_month_coverage(*source)
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    frames = [frame for frame in map_in_script_threads(load, sources, max(1, min(len(sources), 8)))
+              if frame is not None]
+    report = coverage_report(frames)
+    return report, coverage_summary(report), coverage_gaps(report)
+
+def coverage_heatmap(report, measure):
+    data = report[report["파트"] != TEAM_TOTAL]  # 팀 합계는 요약 표에서 확인 (색 범위가 파트 단위로 보이도록)
+    data = data.assign(구분=data["팀"] + " · " + data["파트"])
+    base = alt.Chart(data).encode(
+        x=alt.X("yearmonthdate(날짜):O", title=None, axis=alt.Axis(format="%m/%d", labelOverlap=True)),
+        y=alt.Y("구분:N", title=None, sort=list(dict.fromkeys(data["구분"]))),
+    )
+    heatmap = base.mark_rect().encode(
+        color=alt.Color(f"{measure}:Q", title=f"{measure} 인원", scale=alt.Scale(scheme="blues")),
+        tooltip=["팀", "파트", alt.Tooltip("날짜:T", format="%Y-%m-%d"), f"{measure}:Q"],
+    )
+    gap_column = f"{measure} 공백"
+    if gap_column not in data.columns:
+        return heatmap
+    gaps = base.mark_rect(fill=None, stroke="red", strokeWidth=1.5).transform_filter(alt.datum[gap_column])
+    return heatmap + gaps
+
+# -------------------------------------------------------------------
+# 📤 기간 / 여러 팀 내보내기 (다운로드 버튼을 누를 때만 생성, 같은 조건이면 디스크 캐시 재사용)
+# -------------------------------------------------------------------
+def read_file_bytes(file_path):
+    with open(file_path, "rb") as f:
+        return f.read()
+
+def load_export_matrix(team, year, month, schedule_path):
+    try:
+        return load_person_month_matrix(team, year, month, schedule_path)
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+
+def build_range_export(export_teams, start, end, layout, fmt):
+    return read_file_bytes(export_range(get_catalog(), model_example_root_dir, export_teams, start, end,
+                                        load_export_matrix, layout, fmt))
 
 # -------------------------------------------------------------------
 # Streamlit UI - 팀, 월, 메모, 파일 업로드 등
@@ -194,11 +405,18 @@ st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 st.sidebar.title("팀 선택 ✅")
 teams = ["관제SO팀", "동부SO팀", "보라매SO팀", "백본SO팀", "보안SO팀", "성수SO팀", "중부SO팀"]
 selected_team = st.sidebar.radio("", teams)
+show_all_teams = st.sidebar.toggle("🏢 전체 팀 근무 현황", key="show_all_teams")
+show_coverage = st.sidebar.toggle("📈 근무 인원 분석", key="show_coverage")
 
 today_date = datetime.now(korea_tz)
 current_year = today_date.year
 current_month = today_date.month
 
+# 📚 카탈로그에 등록된 모든 연도 + 올해
+st.sidebar.title("연도 선택 🗓️")
+years = sorted(set(get_catalog().years()) | {current_year})
+selected_year = st.sidebar.selectbox("", years, index=years.index(current_year), key="selected_year")
+
 st.sidebar.title("월 선택 📅")
 months = [f"{i}월" for i in range(1, 13)]
 current_month_index = current_month - 1
@@ -211,16 +429,56 @@ model_example_folder_path = os.path.join(model_example_root_dir, selected_team)
 today_team_folder_path = os.path.join(today_schedules_root_dir, selected_team)
 memo_team_folder_path = os.path.join(memo_root_dir, selected_team)
 
-for folder in [schedules_folder_path, model_example_folder_path, today_team_folder_path, memo_team_folder_path]:
-    create_dir_safe(folder)
+ensure_team_dirs(selected_team)
 
-start_date = datetime(current_year, selected_month_num, 1)
+start_date = datetime(selected_year, selected_month_num, 1)
 end_date = (start_date + timedelta(days=31)).replace(day=1) - timedelta(days=1)
 date_list = [(start_date + timedelta(days=i)) for i in range((end_date - start_date).days + 1)]
+is_current_month = (selected_year, selected_month_num) == (current_year, current_month)
+
+# 🚀 파일 존재 여부는 카탈로그 인덱스로 확인 (없으면 업로드될 경로)
+schedules_file_path = (get_catalog().path_for(selected_team, selected_year, selected_month_num)
+                       or get_catalog().build_path(selected_team, selected_year, selected_month_num))
+model_example_file_path = model_example_path(model_example_root_dir, selected_team)
+memo_file_path = os.path.join(memo_team_folder_path, f"{selected_year}_{selected_month}_memos.jsonl")
+legacy_memo_file_path = os.path.join(memo_team_folder_path, f"{selected_year}_{selected_month}_memos.json")
+
+# -------------------------------------------------------------------
+# 🔔 실시간 갱신: 이 세션이 보고 있는 (팀, 월) 의 변경만 구독
+#    - 전체 팀 현황 / 인원 분석을 켜면 해당 범위까지 구독
+#    - 주기적으로 메모리상의 버전만 비교하고, 바뀐 경우에만 앱 전체를 다시 실행
+# -------------------------------------------------------------------
+selected_month_key = month_key(selected_year, selected_month_num)
+subscription_keys = [(selected_team, selected_month_key)]
+if show_all_teams:
+    subscription_keys.append((ALL, selected_month_key))
+if show_coverage:
+    subscription_keys.append((ALL, ALL))
+change_subscription = st.session_state.get("change_subscription")
+if change_subscription is None or change_subscription.keys != tuple(subscription_keys):
+    change_subscription = st.session_state.change_subscription = get_change_bus().subscribe(subscription_keys)
+change_subscription.mark_seen()  # 이번 실행은 최신 파일을 읽음
+
+change_notice = st.session_state.pop("change_notice", None)
+if change_notice:
+    st.toast(change_notice, icon="🔔")
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS or None)
+def watch_changes():
+    events = st.session_state.change_subscription.changes()
+    if events == []:
+        return
+    if events is None:
+        st.session_state.change_notice = "다른 곳에서 바뀐 내용을 반영했습니다."
+    else:
+        changed = sorted({(event.team, CHANGE_LABELS.get(event.artifact, event.artifact)) for event in events})
+        st.session_state.change_notice = "다른 곳에서 바뀐 내용을 반영했습니다: " + ", ".join(
+            f"{team} {label}" for team, label in changed)
+    st.rerun(scope="app")
 
-schedules_file_path = os.path.join(schedules_folder_path, f"{current_year}_{selected_month}_{selected_team}_schedule.csv")
-model_example_file_path = os.path.join(model_example_folder_path, f"{selected_team}_model_example.csv")
-memo_file_path = os.path.join(memo_team_folder_path, f"{current_year}_{selected_month}_memos.json")
+if LIVE_REFRESH_SECONDS:
+    with st.sidebar:
+        watch_changes()
 
 # -------------------------------------------------------------------
 # 메모 관련 함수 및 UI
@@ -235,40 +493,26 @@ if 'author_name' not in st.session_state:
 def get_korea_time():
     return datetime.now(korea_tz).strftime('%Y-%m-%d %H:%M:%S')
 
+# 기존 JSON 배열 메모 파일이 남아 있으면 JSON Lines 로그로 1회 변환 후 커밋
+def ensure_memo_log():
+    if os.path.exists(legacy_memo_file_path):
+        migrated_files = memo_store.migrate_legacy_memos(legacy_memo_file_path, memo_file_path)
+        publish_changes(migrated_files)
+        git_commit_files(migrated_files, selected_team)
+
+@timed("memo.save")
 def save_memo_with_reset(memo_file_path, memo_text, author=""):
     try:
         memo_dir = os.path.dirname(memo_file_path)
         create_dir_safe(memo_dir)
-        
-        memo_data = {
-            "note": memo_text,
-            "author": author,
-            "timestamp": get_korea_time()
-        }
-        
-        if os.path.exists(memo_file_path):
-            with open(memo_file_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if not content:
-                    memos_list = []
-                else:
-                    memos_list = json.loads(content)
-        else:
-            memos_list = []
-            
-        for existing_memo in memos_list:
-            if (existing_memo["note"] == memo_data["note"] and
-                existing_memo["author"] == memo_data["author"] and
-                existing_memo["timestamp"] == memo_data["timestamp"]):
-                st.info("메모가 중복되었습니다. 저장이 취소됩니다.")
-                return False
-                
-        memos_list.append(memo_data)
-        with open(memo_file_path, "w", encoding="utf-8") as f:
-            json.dump(memos_list, f, ensure_ascii=False, indent=4)
-            
+        ensure_memo_log()
+
+        # 🚀 파일 전체를 다시 쓰지 않고 한 줄만 추가 (중복은 해시 인덱스로 판단)
+        if memo_store.add_memo(memo_file_path, memo_text, author, get_korea_time()) is None:
+            st.info("메모가 중복되었습니다. 저장이 취소됩니다.")
+            return False
         return True
-            
+
     except Exception as e:
         st.error(f"메모 저장 중 오류 발생: {e}")
         return False
@@ -277,6 +521,7 @@ def save_and_reset():
     if st.session_state.new_memo_text.strip():
         if save_memo_with_reset(memo_file_path, st.session_state.new_memo_text.strip(), author=st.session_state.author_name):
             try:
+                publish_changes([memo_file_path])
                 git_auto_commit(memo_file_path, selected_team)
                 st.session_state.new_memo_text = ""
                 st.toast("메모가 저장되었습니다!", icon="✅")
@@ -289,6 +534,49 @@ st.sidebar.text_input("작성자 이름", placeholder="작성자 이름을 입
 st.sidebar.text_area("메모 내용", placeholder="여기에 메모를 입력하세요...", key="new_memo_text")
 st.sidebar.button("메모 저장", on_click=save_and_reset)
 
+# -------------------------------------------------------------------
+# 🔀 근무표 재업로드: 기존 근무표와 셀 단위로 비교하여 바뀐 날짜의 일별 JSON 만 다시 생성
+#    CSV + 바뀐 일별 JSON + 매니페스트 + 변경 이력을 커밋 1회로 반영
+# -------------------------------------------------------------------
+@timed("upload.schedule")
+def apply_schedule_upload(uploaded_file):
+    cache_month = f"{selected_year}-{selected_month_num:02d}"
+    previous_df, previous_exported = None, False
+    if os.path.exists(schedules_file_path):
+        previous_df = load_csv_data(schedules_file_path, selected_team, "schedule", cache_month)
+        # 이전 근무표 기준 일별 JSON 이 최신일 때만 바뀐 날짜만 다시 생성해도 안전
+        previous_exported = os.path.exists(model_example_file_path) and not needs_export(
+            get_export_manifest_path(os.path.join(today_team_folder_path, start_date.strftime('%Y-%m'))),
+            build_export_key(schedules_file_path, model_example_file_path))
+
+    stored_df = ingest_schedule(uploaded_file, schedules_file_path) # 🔼 한 번만 파싱 + 검사 + 원자적 저장
+    get_catalog().register(selected_team, selected_year, selected_month_num, schedules_file_path)
+    get_frame_cache().invalidate(file_path=schedules_file_path) # 🚀 해당 근무표 캐시만 제거
+
+    diff = None if previous_df is None else diff_schedules(previous_df, stored_df, selected_year, selected_month_num)
+    log_path = changelog_path(changelog_root_dir, selected_team, selected_year, selected_month_num)
+    append_changelog(log_path, changelog_entries(
+        diff, selected_year, selected_month_num, get_korea_time(), author=st.session_state.get("author_name", ""),
+        file_name=uploaded_file.name, created_people=len(stored_df)))
+    changed_files = [schedules_file_path, log_path]
+
+    export_dates = []
+    if os.path.exists(model_example_file_path):
+        shift_matrix = load_shift_matrix(
+            selected_team, schedules_file_path, model_example_file_path, selected_year, selected_month_num,
+            file_fingerprint(schedules_file_path), file_fingerprint(model_example_file_path))
+        export_dates = diff.dates if previous_exported and diff is not None and not diff.structural else date_list
+        changed_files += export_month_json(
+            export_dates, today_team_folder_path, shift_matrix,
+            build_export_key(schedules_file_path, model_example_file_path), manifest_date=start_date)
+    publish_changes([schedules_file_path, log_path])
+    git_commit_files(changed_files, selected_team)
+
+    if diff is None:
+        return f"신규 등록 · 일별 JSON {len(export_dates)}일 생성"
+    return (f"변경 {len(diff.changes)}칸 · 추가 {len(diff.added)}명 · 삭제 {len(diff.removed)}명 · "
+            f"일별 JSON {len(export_dates)}일 갱신")
+
 # -------------------------------------------------------------------
 # 관리자 로그인 및 파일 업로드
 # -------------------------------------------------------------------
@@ -314,12 +602,48 @@ if password:
         st.sidebar.success(f"{selected_team} 관리자 모드 활성화 ✨")
         
         if st.sidebar.button("🔄 GitHub 동기화 🔄"):
-            st.session_state.auto_sync_enabled = True
             git_push_changes()
-            git_pull_changes()
-            st.cache_data.clear() # 동기화 후 캐시 초기화
-            st.toast("GitHub에서 최신 데이터 동기화 완료!", icon="🔄")
-            st.session_state.auto_sync_enabled = False
+            frame_cache, catalog, change_watcher = get_frame_cache(), get_catalog(), bootstrap()["change_watcher"]
+            # 동기화 후 바뀐 파일의 캐시만 제거하고 카탈로그 재스캔, 받은 변경은 바로 다른 세션에 알림
+            git_pull_changes(on_complete=lambda: (frame_cache.prune(), catalog.refresh(), change_watcher.scan()))
+            st.toast("GitHub 동기화를 요청했습니다! (백그라운드 진행)", icon="🔄")
+
+        # 동기화 상태 표시
+        sync_status = get_sync_worker().status()
+        st.sidebar.caption(
+            f"⏳ 대기 중인 커밋: {sync_status['pending_commits'] + sync_status['queued']}건 · "
+            f"마지막 푸시: {format_sync_time(sync_status['last_push_at'])} · "
+            f"자동 푸시: {'켜짐' if bootstrap()['auto_push'] else '꺼짐'}"
+        )
+        lock_owner = sync_status["lock_owner"]
+        st.sidebar.caption(
+            f"🔒 Git 잠금 대기: 최근 {sync_status['lock_wait_last']:.2f}초 · 최대 {sync_status['lock_wait_max']:.2f}초"
+            + (f" · 사용 중 (PID {lock_owner['pid']}, {lock_owner['age']:.0f}초)" if lock_owner else "")
+        )
+        if sync_status["last_error"]:
+            st.sidebar.warning(
+                f"동기화 오류 ({format_sync_time(sync_status['last_error_at'])}): {sync_status['last_error']}")
+
+        # 데이터 캐시 적중률 표시
+        cache_stats = get_frame_cache().stats()
+        st.sidebar.caption(
+            f"📦 데이터 캐시: 적중 {cache_stats['hits']} / 미스 {cache_stats['misses']} · "
+            f"{cache_stats['entries']}/{cache_stats['max_entries']}개 사용 중"
+        )
+
+        # ⏱️ 단계별 처리 시간 (p50 / p95)
+        with st.sidebar.expander("⏱️ 성능 지표"):
+            perf_snapshot = perf_registry.snapshot()
+            if perf_snapshot["stages"]:
+                st.dataframe(pd.DataFrame([
+                    {"단계": stage, "횟수": summary["count"], "p50(ms)": round(summary["p50_ms"], 1),
+                     "p95(ms)": round(summary["p95_ms"], 1), "최대(ms)": round(summary["max_ms"], 1)}
+                    for stage, summary in perf_snapshot["stages"].items()
+                ]), hide_index=True, use_container_width=True)
+            else:
+                st.write("측정된 데이터가 없습니다.")
+            st.download_button("📥 JSON 다운로드", data=perf_registry.to_json(),
+                               file_name="rsw_metrics.json", mime="application/json")
 
         # 근무표 파일 업로드
         uploaded_schedule_file = st.sidebar.file_uploader(
@@ -339,33 +663,28 @@ if password:
                     st.session_state.schedules_upload_confirmed = False
 
             if st.session_state.schedules_upload_confirmed:
+                upload_id = (uploaded_schedule_file.file_id, schedules_file_path)
                 try:
-                    if uploaded_schedule_file.name.endswith(".xlsx"):
-                        df = pd.read_excel(uploaded_schedule_file, sheet_name=0)
-                    elif uploaded_schedule_file.name.endswith(".csv"):
-                        uploaded_schedule_file.seek(0)
-                        try:
-                            df = pd.read_csv(uploaded_schedule_file, encoding='utf-8-sig')
-                        except Exception:
-                            try:
-                                uploaded_schedule_file.seek(0)
-                                df = pd.read_csv(uploaded_schedule_file, encoding='utf-8')
-                            except Exception:
-                                uploaded_schedule_file.seek(0)
-                                df = pd.read_csv(uploaded_schedule_file, encoding='cp949')
-
-                    df.to_csv(schedules_file_path, index=False, encoding='utf-8-sig')
-                    git_auto_commit(schedules_file_path, selected_team)
-                    st.cache_data.clear() # 🚀 파일 갱신 후 데이터 캐시 초기화
+                    # 같은 업로드 파일은 rerun 마다 다시 처리하지 않음
+                    if st.session_state.get("schedule_ingested_id") != upload_id:
+                        st.session_state.schedule_upload_summary = apply_schedule_upload(uploaded_schedule_file)
+                        st.session_state.schedule_ingested_id = upload_id
                     st.sidebar.success(f"{selected_month} 근무표 업로드 완료 ⭕")
+                    st.sidebar.caption(st.session_state.get("schedule_upload_summary", ""))
+                except UploadError as e:
+                    st.sidebar.error(f"근무표 형식 오류: {e}")
                 except Exception as e:
                     st.sidebar.error(f"파일 처리 중 오류 발생: {e}")
             elif st.session_state.schedules_upload_canceled:
                 try:
                     if os.path.exists(schedules_file_path):
                         os.remove(schedules_file_path)
+                    remove_columnar(schedules_file_path)
+                    get_catalog().unregister(selected_team, selected_year, selected_month_num)
+                    st.session_state.pop("schedule_ingested_id", None)
+                    publish_changes([schedules_file_path])
                     git_auto_commit(schedules_file_path, selected_team)
-                    st.cache_data.clear() # 🚀 파일 삭제 후 데이터 캐시 초기화
+                    get_frame_cache().invalidate(file_path=schedules_file_path) # 🚀 해당 근무표 캐시만 제거
                     st.sidebar.warning(f"{selected_team} 근무표 업로드 취소 완료 ❌")
                 except Exception as delete_error:
                     st.sidebar.error(f"파일 삭제 중 오류 발생: {delete_error}")
@@ -388,26 +707,19 @@ if password:
                     st.session_state.model_example_upload_confirmed = False
 
             if st.session_state.model_example_upload_confirmed:
+                file_path = os.path.join(model_example_folder_path, f"{selected_team}_model_example.csv")
+                upload_id = (uploaded_model_example_file.file_id, file_path)
                 try:
-                    if uploaded_model_example_file.name.endswith(".xlsx"):
-                        df = pd.read_excel(uploaded_model_example_file, sheet_name=0)
-                    elif uploaded_model_example_file.name.endswith(".csv"):
-                        uploaded_model_example_file.seek(0)
-                        try:
-                            df = pd.read_csv(uploaded_model_example_file, encoding='utf-8-sig')
-                        except Exception:
-                            try:
-                                uploaded_model_example_file.seek(0)
-                                df = pd.read_csv(uploaded_model_example_file, encoding='utf-8')
-                            except Exception:
-                                uploaded_model_example_file.seek(0)
-                                df = pd.read_csv(uploaded_model_example_file, encoding='cp949')
-                                
-                    file_path = os.path.join(model_example_folder_path, f"{selected_team}_model_example.csv")
-                    df.to_csv(file_path, index=False, encoding='utf-8-sig')
-                    git_auto_commit(file_path, selected_team)
-                    st.cache_data.clear() # 🚀 파일 갱신 후 데이터 캐시 초기화
+                    if st.session_state.get("model_example_ingested_id") != upload_id:
+                        ingest_legend(uploaded_model_example_file, file_path) # 🔼 한 번만 파싱 + 검사 + 원자적 저장
+                        publish_changes([file_path])
+                        git_auto_commit(file_path, selected_team)
+                        get_frame_cache().invalidate(file_path=file_path) # 🚀 해당 범례 캐시만 제거
+                        st.session_state.force_json_export = True # 업로드 직후 일별 JSON 강제 재생성
+                        st.session_state.model_example_ingested_id = upload_id
                     st.sidebar.success(f"{selected_team} 범례 업로드 완료 ⭕")
+                except UploadError as e:
+                    st.sidebar.error(f"범례 형식 오류: {e}")
                 except Exception as e:
                     st.sidebar.error(f"파일 처리 중 오류 발생: {e}")
             elif st.session_state.model_example_upload_canceled:
@@ -415,8 +727,10 @@ if password:
                 try:
                     if os.path.exists(file_path):
                         os.remove(file_path)
+                    st.session_state.pop("model_example_ingested_id", None)
+                    publish_changes([file_path])
                     git_auto_commit(file_path, selected_team)
-                    st.cache_data.clear() # 🚀 파일 삭제 후 데이터 캐시 초기화
+                    get_frame_cache().invalidate(file_path=file_path) # 🚀 해당 범례 캐시만 제거
                     st.sidebar.warning(f"{selected_team} 범례 취소 완료 ❌")
                 except Exception as delete_error:
                     st.sidebar.error(f"파일 삭제 중 오류 발생: {delete_error}")
@@ -425,189 +739,156 @@ if password:
 
 st.sidebar.markdown("🙋 :blue[문의 : 관제SO팀]")
 
+if show_all_teams:
+    board_date = st.date_input("전체 팀 근무 날짜 📅", today_date.date(), key="all_teams_date")
+    board, missing_teams = load_all_teams_board(teams, board_date)
+    st.header(f"{board_date.strftime('%Y-%m-%d')} 전체 팀 근무 현황 🏢")
+    if missing_teams:
+        st.caption(f"근무표가 없는 팀: {', '.join(missing_teams)}")
+    board_col1, board_col2, board_col3 = st.columns(3)
+    for board_col, kind, title in ((board_col1, SHIFT_DAY, "주간 근무자 ☀️"),
+                                   (board_col2, SHIFT_NIGHT, "야간 근무자 🌙"),
+                                   (board_col3, SHIFT_VACATION, "휴가 근무자 🌴")):
+        with board_col:
+            render_shift_table(f"{title} ({len(board[kind])}명)", board[kind], "근무자가 없습니다.")
+    st.divider()
+
+if show_coverage:
+    coverage_col1, coverage_col2 = st.columns(2)
+    with coverage_col1:
+        coverage_scope = st.radio("분석 기간", ["월", "연도"], horizontal=True, key="coverage_scope")
+    with coverage_col2:
+        coverage_measure = st.radio("표시 항목", list(COVERAGE_KINDS.values()), horizontal=True, key="coverage_measure")
+    coverage_teams = st.multiselect("분석할 팀", teams, default=teams, key="coverage_teams")
+    coverage_month = selected_month_num if coverage_scope == "월" else None
+    st.header(f"{selected_year}년 {selected_month + ' ' if coverage_month else ''}근무 인원 분석 📈")
+
+    with timer("coverage.report"):
+        coverage, coverage_table, coverage_gap_table = load_coverage_report(
+            coverage_sources(coverage_teams, selected_year, coverage_month))
+    if coverage.empty:
+        st.info("분석할 근무표가 없습니다.")
+    else:
+        st.altair_chart(coverage_heatmap(coverage, coverage_measure), use_container_width=True)
+        st.caption("빨간 테두리: 평소 해당 근무를 맡는 파트가 0명인 날짜 (팀장 제외)")
+        st.write("팀 · 파트별 요약")
+        st.dataframe(coverage_table, hide_index=True, use_container_width=True)
+        st.write(f"공백 ({len(coverage_gap_table)}건)")
+        if coverage_gap_table.empty:
+            st.write("공백이 없습니다.")
+        else:
+            st.dataframe(coverage_gap_table, hide_index=True, use_container_width=True,
+                         column_config={"날짜": st.column_config.DateColumn(format="YYYY-MM-DD")})
+    st.divider()
+
+with st.expander("📤 기간 / 전체 팀 내보내기"):
+    export_teams = st.multiselect("팀", teams, default=[selected_team], key="export_teams")
+    export_period = st.date_input("기간", (start_date.date(), end_date.date()), key="export_period")
+    export_col1, export_col2 = st.columns(2)
+    with export_col1:
+        export_layout = st.radio("내용", list(LAYOUTS), horizontal=True, key="export_layout",
+                                 format_func={"roster": "근무표 (구성원 × 날짜)", "daily": "일별 근무자"}.get)
+    with export_col2:
+        export_format = st.radio("파일 형식", list(FORMATS), horizontal=True, key="export_format",
+                                 format_func=str.upper)
+    if len(export_period) == 2:
+        export_start, export_end = export_period
+        try:
+            validate_export(export_teams, export_start, export_end, export_layout, export_format)
+            st.download_button(
+                label="📥 내보내기 다운로드",
+                data=partial(build_range_export, list(export_teams), export_start, export_end,
+                             export_layout, export_format),
+                file_name=export_file_name(export_teams, export_start, export_end, export_layout, export_format),
+                mime=FORMATS[export_format],
+                on_click="ignore",
+                key="export_download"
+            )
+        except ExportError as e:
+            st.warning(str(e))
+    else:
+        st.caption("시작일과 종료일을 모두 선택하세요.")
+
 try:
     # 🚀 캐싱된 함수를 사용하여 데이터를 로드합니다!
-    df = load_csv_data(schedules_file_path)
-    
-    if selected_month_num == current_month:
-        default_date = today_date
-    else:
-        default_date = datetime(current_year, selected_month_num, 1)
+    df = load_csv_data(schedules_file_path, selected_team, "schedule", f"{selected_year}-{selected_month_num:02d}")
 
     col1, col2 = st.columns([1.5, 1])
     with col1:
-        st.header(f"{selected_team} {selected_month} 근무표")
+        st.header(f"{selected_team} {selected_year}년 {selected_month} 근무표")
     with col2:
-        buffer = BytesIO()
-        df.to_csv(buffer, index=False, encoding="utf-8-sig")
-        buffer.seek(0)
         st.write("")
         st.download_button(
             label="📊 엑셀 다운로드",
-            data=buffer,
-            file_name=f"{selected_team}_{selected_month}_근무표.csv",
-            mime="text/csv"
+            data=partial(read_file_bytes, schedules_file_path), # 다운로드는 원본 CSV 그대로 (누를 때만 읽음)
+            file_name=f"{selected_team}_{selected_year}_{selected_month}_근무표.csv",
+            mime="text/csv",
+            on_click="ignore"
         )
 
     try:
-        # 🚀 캐싱된 함수를 사용하여 데이터를 로드합니다!
-        df_schedule = load_csv_data(schedules_file_path)
-        df_model = load_csv_data(model_example_file_path)
-        df_model = df_model.dropna(subset=["실제 근무", "팀 근무기호"])
-        work_mapping = dict(zip(df_model["팀 근무기호"], df_model["실제 근무"]))
-
-        if selected_month_num == current_month:
+        # 🚀 월 전체 근무 분류 결과를 한 번만 계산하여 화면/JSON 모두 재사용
+        shift_matrix = load_shift_matrix(
+            selected_team, schedules_file_path, model_example_file_path, selected_year, selected_month_num,
+            file_fingerprint(schedules_file_path), file_fingerprint(model_example_file_path))
+
+        # 📐 요일이 실제 날짜와 맞지 않는 열 안내 (날짜 번호 기준으로 표시)
+        schedule_schema = load_schedule_schema(schedules_file_path, selected_team, selected_year, selected_month_num)
+        if schedule_schema.mismatches:
+            st.warning("⚠️ 요일이 날짜와 맞지 않는 열이 있습니다: " + ", ".join(
+                f"{col} → {label}" for col, label in schedule_schema.mismatches))
+
+        # 📖 범례에 없는 근무기호 안내 (근무자 표에서는 제외됨)
+        if shift_matrix.unknown:
+            st.warning("⚠️ 범례에 없는 근무기호가 있습니다 (근무자 표에서 제외): " + ", ".join(
+                f"{code} ({count}칸)" for code, count in sorted(shift_matrix.unknown.items(), key=lambda item: -item[1])))
+
+        if is_current_month:
             default_date = today_date.date()
         else:
-            default_date = datetime(current_year, selected_month_num, 1).date()
+            default_date = start_date.date()
 
-        # -------------------------------------------------------------
-        # ✨ 수정: 날짜 형식 1(금) 과 01(금) 동시 지원 로직 적용 (UI 화면용)
-        # -------------------------------------------------------------
         st.subheader("날짜 선택 📅")
         selected_date = st.date_input("날짜를 선택하세요:", default_date)
-        
-        weekday_str = ['월','화','수','목','금','토','일'][selected_date.weekday()]
-        col_no_zero = f"{selected_date.day}({weekday_str})"       # 예: 1(금)
-        col_with_zero = f"{selected_date.day:02d}({weekday_str})" # 예: 01(금)
-        
-        df_schedule.columns = df_schedule.columns.str.strip()
-        
-        if col_with_zero in df_schedule.columns:
-            today_column = col_with_zero
-        else:
-            today_column = col_no_zero
-
-        if today_column in df_schedule.columns:
-            df_schedule["근무 형태"] = df_schedule[today_column].map(work_mapping).fillna("")
-            excluded_keywords = ["휴", "숙", "대휴(주)", "휴대(주)"]
-            filtered_schedule = df_schedule[~df_schedule[today_column].isin(excluded_keywords)].copy()
-            day_shift = filtered_schedule[filtered_schedule["근무 형태"].str.contains("주", na=False)].copy()
-            night_shift = filtered_schedule[filtered_schedule["근무 형태"].str.contains("야", na=False)].copy()
-
-            day_shift["우선순위"] = day_shift["파트 구분"].apply(lambda x: 0 if "총괄" in x else 1)
-            night_shift["우선순위"] = night_shift["파트 구분"].apply(lambda x: 0 if "총괄" in x else 1)
-
-            day_shift.sort_values(by=["우선순위", "파트 구분", "이름"], ascending=[True, True, True], inplace=True)
-            night_shift.sort_values(by=["우선순위", "파트 구분", "이름"], ascending=[True, True, True], inplace=True)
 
+        # 📚 다른 월/연도 날짜도 카탈로그로 바로 찾아서 표시
+        if (selected_date.year, selected_date.month) == (selected_year, selected_month_num):
+            view_matrix = shift_matrix
+        else:
+            view_schedule_path = get_catalog().resolve_date(selected_team, selected_date)
+            view_matrix = None
+            if view_schedule_path:
+                view_matrix = load_shift_matrix(
+                    selected_team, view_schedule_path, model_example_file_path, selected_date.year, selected_date.month,
+                    file_fingerprint(view_schedule_path), file_fingerprint(model_example_file_path))
+
+        if view_matrix is not None and view_matrix.has_date(selected_date):
+            # 🚀 정렬 / 총괄→팀장 변환은 근무 분류 결과에서 한 번만 계산 → 근무별 표 1개씩 렌더링
             st.subheader(f"{selected_date.strftime('%Y-%m-%d')} {selected_team} 근무자 📋")
 
             col1, col2 = st.columns(2)
             with col1:
-                st.write("주간 근무자 ☀️")
-                if not day_shift.empty:
-                    for part in day_shift["파트 구분"].unique():
-                        part_group = day_shift[day_shift["파트 구분"] == part]
-                        part_display_day = part_group[["파트 구분", "이름", today_column]].rename(
-                            columns={"파트 구분": "파트", today_column: "근무"})
-                        part_display_day["파트"] = part_display_day["파트"].replace("총괄", "팀장")
-                        part_display_day.index = ['🌇'] * len(part_display_day)
-                        styled_table_day = part_display_day.style.set_table_styles([
-                            {'selector': 'td', 'props': [('text-align', 'center'), ('width', '100px'),
-                                                         ('min-width', '100px'), ('max-width', '100px'),
-                                                         ('box-sizing', 'border-box')]}
-                        ])
-                        st.table(styled_table_day)
-                else:
-                    st.write("주간 근무자가 없습니다.")
-
+                render_shift_table("주간 근무자 ☀️", shift_board(view_matrix, selected_date, SHIFT_DAY),
+                                   "주간 근무자가 없습니다.")
             with col2:
-                st.write("야간 근무자 🌙")
-                if not night_shift.empty:
-                    for part in night_shift["파트 구분"].unique():
-                        part_group = night_shift[night_shift["파트 구분"] == part]
-                        part_display_night = part_group[["파트 구분", "이름", today_column]].rename(
-                            columns={"파트 구분": "파트", today_column: "근무"})
-                        part_display_night["파트"] = part_display_night["파트"].replace("총괄", "팀장")
-                        part_display_night.index = ['🌃'] * len(part_display_night)
-                        styled_table_night = part_display_night.style.set_table_styles([
-                            {'selector': 'td', 'props': [('text-align', 'center'), ('width', '100px'),
-                                                         ('min-width', '100px'), ('max-width', '100px'),
-                                                         ('box-sizing', 'border-box')]}
-                        ])
-                        st.table(styled_table_night)
-                else:
-                    st.write("야간 근무자가 없습니다.")
-
-                st.write("휴가 근무자 🌴")
-                vacation_keywords = ["휴가(주)", "대휴(주)", "대휴", "경조", "연차", "휴가(야)", "휴가(숙)", "건검(주)"]
-                vacation_shift = df_schedule[df_schedule[today_column].isin(vacation_keywords)].copy()
-                if not vacation_shift.empty:
-                    vacation_display = vacation_shift[["파트 구분", "이름", today_column]].rename(
-                        columns={"파트 구분": "파트", today_column: "근무"})
-                    vacation_display["파트"] = vacation_display["파트"].replace("총괄", "팀장")
-                    vacation_display.index = ['🌄'] * len(vacation_display)
-                    styled_table_vacation = vacation_display.style.set_table_styles([
-                        {'selector': 'td', 'props': [('text-align', 'center'), ('width', '100px'),
-                                                     ('min-width', '100px'), ('max-width', '100px'),
-                                                     ('box-sizing', 'border-box')]}
-                    ])
-                    st.table(styled_table_vacation)
-                else:
-                    st.write("휴가 근무자가 없습니다.")
+                render_shift_table("야간 근무자 🌙", shift_board(view_matrix, selected_date, SHIFT_NIGHT),
+                                   "야간 근무자가 없습니다.")
+                render_shift_table("휴가 근무자 🌴", shift_board(view_matrix, selected_date, SHIFT_VACATION),
+                                   "휴가 근무자가 없습니다.")
         else:
-            st.warning(f"선택한 날짜 ({today_column})에 해당하는 데이터가 없습니다.")
-
-        def save_monthly_schedules_to_json(date_list, today_team_folder_path, df_schedule, work_mapping):
-            created_files = []  
-            for date in date_list:
-                month_folder = os.path.join(today_team_folder_path, date.strftime('%Y-%m'))
-                if not os.path.exists(month_folder):
-                    os.mkdir(month_folder)
-                json_file_path = os.path.join(month_folder, f"{date.strftime('%Y-%m-%d')}_schedule.json")
-                
-                # -------------------------------------------------------------
-                # ✨ 수정: 날짜 형식 1(금) 과 01(금) 동시 지원 로직 적용 (JSON 백그라운드용)
-                # -------------------------------------------------------------
-                weekday_str = ['월','화','수','목','금','토','일'][date.weekday()]
-                col_no_zero = f"{date.day}({weekday_str})"
-                col_with_zero = f"{date.day:02d}({weekday_str})"
-                
-                if col_with_zero in df_schedule.columns:
-                    today_column = col_with_zero
-                else:
-                    today_column = col_no_zero
-
-                if today_column in df_schedule.columns:
-                    df_schedule["근무 형태"] = df_schedule[today_column].map(work_mapping).fillna("")
-                    day_shift = df_schedule[df_schedule["근무 형태"].str.contains("주", na=False)].copy()
-                    day_shift_data = day_shift[["파트 구분", "이름", today_column]].rename(
-                        columns={"파트 구분": "파트", today_column: "근무"}
-                    ).to_dict(orient="records")
-
-                    night_shift = df_schedule[df_schedule["근무 형태"].str.contains("야", na=False)].copy()
-                    night_shift_data = night_shift[["파트 구분", "이름", today_column]].rename(
-                        columns={"파트 구분": "파트", today_column: "근무"}
-                    ).to_dict(orient="records")
-
-                    vacation_keywords = ["휴가(주)", "대휴(주)", "대휴", "경조", "연차", "휴가(야)", "휴가(숙)", "건검(주)"]
-                    vacation_shift = df_schedule[df_schedule[today_column].isin(vacation_keywords)].copy()
-                    vacation_shift_data = vacation_shift[["파트 구분", "이름", today_column]].rename(
-                        columns={"파트 구분": "파트", today_column: "근무"}
-                    ).to_dict(orient="records")
-
-                    schedule_data = {
-                        "date": date.strftime('%Y-%m-%d'),
-                        "day_shift": day_shift_data,
-                        "night_shift": night_shift_data,
-                        "vacation_shift": vacation_shift_data
-                    }
-                else:
-                    schedule_data = {
-                        "date": date.strftime('%Y-%m-%d'),
-                        "day_shift": [],
-                        "night_shift": [],
-                        "vacation_shift": []
-                    }
-                with open(json_file_path, "w", encoding="utf-8") as json_file:
-                    json.dump(schedule_data, json_file, ensure_ascii=False, indent=4)
-                created_files.append(json_file_path)
-            
-            for file_path in created_files:
-                git_auto_commit(file_path, selected_team)
+            st.warning(f"선택한 날짜 ({day_column_label(selected_date)})에 해당하는 데이터가 없습니다.")
 
-        save_monthly_schedules_to_json(date_list, today_team_folder_path, df_schedule, work_mapping)
+        @timed("save_monthly_schedules_to_json")
+        def save_monthly_schedules_to_json(date_list, today_team_folder_path, shift_matrix, export_key=None):
+            # 🚀 변경된 파일들을 한 번의 커밋으로 반영
+            git_commit_files(export_month_json(date_list, today_team_folder_path, shift_matrix, export_key), selected_team)
+
+        # 🚀 원본 CSV/범례/포맷 버전이 그대로면 일별 JSON 재생성 생략
+        export_key = build_export_key(schedules_file_path, model_example_file_path)
+        export_manifest_path = get_export_manifest_path(
+            os.path.join(today_team_folder_path, start_date.strftime('%Y-%m')))
+        if st.session_state.pop("force_json_export", False) or needs_export(export_manifest_path, export_key):
+            save_monthly_schedules_to_json(date_list, today_team_folder_path, shift_matrix, export_key)
 
         def validate_date_format(date_str):
             try:
@@ -668,6 +949,20 @@ try:
     except Exception as e:
         st.error(f"오류가 발생했습니다: {e}")
 
+    # 📝 재업로드 변경 이력 (파일이 바뀐 경우에만 다시 읽음)
+    month_changelog_path = changelog_path(changelog_root_dir, selected_team, selected_year, selected_month_num)
+    if os.path.exists(month_changelog_path):
+        with st.expander("📝 근무표 변경 이력"):
+            changelog = get_frame_cache().get(
+                month_changelog_path, team=selected_team, kind="changelog",
+                month=f"{selected_year}-{selected_month_num:02d}", loader=load_changelog)
+            changelog_name = st.text_input("이름으로 찾기", key="changelog_name")
+            changelog_view = query_changelog(changelog, name=changelog_name)
+            st.caption(f"{len(changelog_view)}건")
+            st.dataframe(changelog_view[["uploaded_at", "message", "author"]].rename(
+                columns={"uploaded_at": "업로드 시각", "message": "변경 내용", "author": "작성자"}),
+                hide_index=True, use_container_width=True)
+
     exclude_columns = ['본부 구분', '팀 구분', '년/월', '근무 구분']
     filtered_df = df.drop(columns=[col for col in exclude_columns if col in df.columns], errors='ignore')
 
@@ -686,73 +981,96 @@ try:
     st.subheader("🔍 구성원 근무표 검색")
     employee_name = st.text_input(f"{selected_team} 구성원 이름 입력")
     if employee_name:
-        filtered_df = df[df["이름"].str.contains(employee_name, na=False)]
-        if not filtered_df.empty:
+        # 🚀 미리 만들어 둔 구성원 인덱스로 조회 (DataFrame 재검색 없음)
+        person_index = get_person_index()
+        matched_rows = person_index.rows_for(employee_name, selected_team, selected_year, selected_month_num)
+        if matched_rows:
             st.write(f"**{employee_name}** 님의 근무표")
-            st.dataframe(filtered_df, hide_index=True)
+            st.dataframe(df.iloc[matched_rows], hide_index=True)
         else:
             st.warning(f"'{employee_name}' 님의 데이터가 없습니다.")
 
+        upcoming_shifts = person_index.upcoming(employee_name, today_date.date(), days=60)
+        st.write(f"📅 **{employee_name}** 님의 향후 60일 근무 (전체 팀)")
+        if upcoming_shifts:
+            st.dataframe(pd.DataFrame(upcoming_shifts), hide_index=True)
+        else:
+            st.info("향후 60일간 등록된 근무가 없습니다.")
+
 except FileNotFoundError:
-    st.info(f"❌ {selected_month} 근무표가 등록되지 않았습니다.")
+    st.info(f"❌ {selected_year}년 {selected_month} 근무표가 등록되지 않았습니다.")
 
-st.header(f"{selected_team} - {selected_month} 메모 📗")
+st.header(f"{selected_team} - {selected_year}년 {selected_month} 메모 📗")
 
-def load_memos(memo_file_path):
-    if os.path.exists(memo_file_path):
-        with open(memo_file_path, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if not content:
-                return []
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError as e:
-                st.error(f"JSON 파일 읽기 오류: {e}")
-                return []
-    return []
+MEMO_PAGE_SIZE = 10
+MEMO_TOP_LINE = "🔻" * 32
+MEMO_BOTTOM_LINE = "🔺" * 32
+
+@timed("memo.load_recent")
+def load_recent_memos(memo_file_path, limit):
+    try:
+        ensure_memo_log()
+        return memo_store.load_recent_memos(memo_file_path, limit)
+    except (OSError, ValueError) as e:
+        st.error(f"메모 파일 읽기 오류: {e}")
+        return [], 0
 
-def delete_memo_and_refresh(timestamp):
+def delete_memo_and_refresh(target_memo_id):
     if not st.session_state.get("admin_authenticated", False):
         return
 
-    if os.path.exists(memo_file_path):
-        with open(memo_file_path, "r", encoding="utf-8") as f:
-            memos_list = json.load(f)
-
-        updated_memos = [memo for memo in memos_list if memo['timestamp'] != timestamp]
+    with timer("memo.delete"):
+        memo_store.delete_memo(memo_file_path, target_memo_id)
 
-        if updated_memos:
-            with open(memo_file_path, "w", encoding="utf-8") as f:
-                json.dump(updated_memos, f, ensure_ascii=False, indent=4)
-        else:
-            os.remove(memo_file_path)
-    
+    publish_changes([memo_file_path])
     git_auto_commit(memo_file_path, selected_team)
     st.toast("메모가 성공적으로 삭제되었습니다!", icon="💣")
     time.sleep(1)
     st.rerun()
 
-memos_list = load_memos(memo_file_path)
-if memos_list:
-    for idx, memo in enumerate(reversed(memos_list)):
+# 🚀 최신 메모부터 MEMO_PAGE_SIZE 개씩만 렌더링 ("더 보기"로 추가 로드)
+memo_page_key = f"memo_visible_count_{memo_file_path}"
+visible_memo_count = st.session_state.get(memo_page_key, MEMO_PAGE_SIZE)
+
+def show_more_memos():
+    st.session_state[memo_page_key] = visible_memo_count + MEMO_PAGE_SIZE
+
+recent_memos, total_memo_count = load_recent_memos(memo_file_path, visible_memo_count)
+if recent_memos:
+    is_admin = st.session_state.get("admin_authenticated", False)
+    if not is_admin:
+        st.info("🙋 삭제는 관리자에게 문의 부탁드립니다!🗑️")
+
+    for memo in recent_memos:
         timestamp_obj = datetime.strptime(memo['timestamp'], '%Y-%m-%d %H:%M:%S')
         formatted_timestamp = timestamp_obj.strftime('%Y-%m-%d %H:%M')
-
-        st.markdown(f"📢 **{memo['author']}**님 ({formatted_timestamp})")
-        st.write("🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻🔻")
         memo_content = memo["note"].replace("\n", "<br>")
-        st.markdown(f"<div style='font-size: 16px; font-weight: 400; line-height: 1.6;'>{memo_content}</div>", unsafe_allow_html=True)
-        st.write("🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺🔺")
-        
-        if st.session_state.get("admin_authenticated", False):
+
+        # 메모 1개당 요소 1개로 렌더링 (작성자 / 구분선 / 본문)
+        st.markdown(
+            f"📢 **{memo['author']}**님 ({formatted_timestamp})\n\n"
+            f"{MEMO_TOP_LINE}\n\n"
+            f"<div style='font-size: 16px; font-weight: 400; line-height: 1.6;'>{memo_content}</div>\n\n"
+            f"{MEMO_BOTTOM_LINE}",
+            unsafe_allow_html=True
+        )
+
+        if is_admin:
             if st.button(
                 f"❌ 메모 삭제 ❌ (작성자: {memo['author']} / 작성 시간: {formatted_timestamp})",
-                key=f"delete_{formatted_timestamp}_{idx}"
+                key=f"delete_{memo['id']}"
             ):
-                delete_memo_and_refresh(memo['timestamp'])
-        else:
-            st.info("🙋 삭제는 관리자에게 문의 부탁드립니다!🗑️")
-        
+                delete_memo_and_refresh(memo['id'])
+
         st.markdown("---")
+
+    if total_memo_count > len(recent_memos):
+        st.button(
+            f"⬇️ 이전 메모 더 보기 ({len(recent_memos)}/{total_memo_count})",
+            key=f"more_{memo_page_key}",
+            on_click=show_more_memos
+        )
 else:
-    st.info(f"{selected_team}의 {selected_month}에 저장된 메모가 없습니다.")
+    st.info(f"{selected_team}의 {selected_year}년 {selected_month}에 저장된 메모가 없습니다.")
+
+perf_registry.record("rerun", (time.perf_counter() - rerun_started) * 1000)
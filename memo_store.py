@@ -0,0 +1,202 @@
+import os
+import json
+import hashlib
+import threading
+from itertools import islice
+from collections import OrderedDict
+
+from atomic_io import FileLock, write_bytes_atomic
+
+# -------------------------------------------------------------------
+# 📝 메모 저장소 (JSON Lines, 추가 전용 로그)
+#   - 저장: {"op": "add", "id", "note", "author", "timestamp"} 한 줄 추가
+#   - 삭제: {"op": "del", "id"} 툼스톤 한 줄 추가
+#   - 툼스톤이 많이 쌓이면 살아있는 메모만 남기도록 압축
+#   - 메모 ID 는 (작성자, 작성 시간, 내용) 해시 → 중복 판단에도 사용
+# -------------------------------------------------------------------
+COMPACT_MIN_TOMBSTONES = 32
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+_indexes = {}  # path -> {"offset", "inode", "memos": OrderedDict, "tombstones"}
+
+def memo_id(note, author, timestamp):
+    raw = json.dumps([author, timestamp, note], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def _get_path_lock(path):
+    with _path_locks_guard:
+        return _path_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+class _MemoLock:
+    # 파일 잠금(다른 프로세스) + 인덱스 잠금(같은 프로세스의 읽기 스레드) 함께 획득
+    def __init__(self, path):
+        self.file_lock = FileLock(path)
+        self.index_lock = _get_path_lock(path)
+
+    def __enter__(self):
+        self.file_lock.__enter__()
+        self.index_lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.index_lock.release()
+        self.file_lock.__exit__(*exc)
+
+def _fingerprint(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size)
+
+# -------------------------------------------------------------------
+# 인덱스 갱신: 마지막으로 읽은 위치 이후에 추가된 줄만 읽음
+# -------------------------------------------------------------------
+def _apply_record(index, record):
+    if record.get("op") == "del":
+        if index["memos"].pop(record.get("id"), None) is not None:
+            index["tombstones"] += 1
+    else:
+        memo = {
+            "id": record["id"],
+            "note": record["note"],
+            "author": record.get("author", ""),
+            "timestamp": record["timestamp"],
+        }
+        index["memos"][memo["id"]] = memo
+
+def _refresh_index(path):
+    fingerprint = _fingerprint(path)
+    index = _indexes.get(path)
+    if fingerprint is None:
+        index = {"offset": 0, "inode": None, "memos": OrderedDict(), "tombstones": 0}
+        _indexes[path] = index
+        return index
+
+    inode, size = fingerprint
+    if index is None or index["inode"] != inode or size < index["offset"]:
+        # 처음 읽거나 압축 등으로 파일이 교체된 경우 전체 재구성
+        index = {"offset": 0, "inode": inode, "memos": OrderedDict(), "tombstones": 0}
+        _indexes[path] = index
+
+    if size > index["offset"]:
+        with open(path, "rb") as f:
+            f.seek(index["offset"])
+            chunk = f.read(size - index["offset"])
+        # 마지막 줄이 아직 쓰는 중이면 다음 갱신 때 읽음
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            if line.strip():
+                try:
+                    _apply_record(index, json.loads(line))
+                except (json.JSONDecodeError, KeyError):
+                    continue
+        index["offset"] += len(complete)
+    return index
+
+def _append_record(path, record):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+# -------------------------------------------------------------------
+# 공개 함수
+# -------------------------------------------------------------------
+def load_memos(path):
+    with _get_path_lock(path):
+        return list(_refresh_index(path)["memos"].values())
+
+def load_recent_memos(path, limit):
+    # 최신 메모부터 limit 개만 반환 (전체 개수도 함께 반환)
+    with _get_path_lock(path):
+        memos = _refresh_index(path)["memos"]
+        return list(islice(reversed(memos.values()), limit)), len(memos)
+
+def add_memo(path, note, author, timestamp):
+    memo = {"id": memo_id(note, author, timestamp), "note": note, "author": author, "timestamp": timestamp}
+    with _MemoLock(path):
+        index = _refresh_index(path)
+        if memo["id"] in index["memos"]:
+            return None  # 중복 메모
+        _append_record(path, {"op": "add", **memo})
+        return memo
+
+def delete_memo(path, target_id):
+    with _MemoLock(path):
+        index = _refresh_index(path)
+        if target_id not in index["memos"]:
+            return False
+        _append_record(path, {"op": "del", "id": target_id})
+        index = _refresh_index(path)
+        if index["tombstones"] >= COMPACT_MIN_TOMBSTONES and index["tombstones"] > len(index["memos"]):
+            _compact_locked(path, index)
+        return True
+
+def compact(path):
+    with _MemoLock(path):
+        _compact_locked(path, _refresh_index(path))
+
+def _compact_locked(path, index):
+    # 살아있는 메모만 새 파일에 쓰고 교체 (메모가 없으면 파일 삭제)
+    if not index["memos"]:
+        if os.path.exists(path):
+            os.remove(path)
+        _indexes.pop(path, None)
+        return
+    lines = [json.dumps({"op": "add", **memo}, ensure_ascii=False) + "\n" for memo in index["memos"].values()]
+    write_bytes_atomic(path, "".join(lines).encode("utf-8"))
+    _indexes.pop(path, None)
+
+# -------------------------------------------------------------------
+# 기존 JSON 배열 메모 파일(*.json) → JSON Lines 로그로 1회 변환
+#   로그가 이미 있어도(예: 이전 버전 인스턴스가 쓴 파일을 git pull 로 받은 경우) 병합
+#   메모 ID 가 결정적이므로 로그에 한 번이라도 기록된 ID(삭제 포함)는 건너뜀
+# -------------------------------------------------------------------
+def _logged_ids(path):
+    ids = set()
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    ids.add(json.loads(line)["id"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return ids
+
+def migrate_legacy_memos(legacy_path, path):
+    if not os.path.exists(legacy_path):
+        return []
+    with _MemoLock(path):
+        # 다른 세션이 먼저 변환했을 수 있으므로 잠금 후 다시 확인
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+        except FileNotFoundError:
+            return []
+        memos = json.loads(content) if content else []
+        logged_ids = _logged_ids(path)
+        for memo in memos:
+            record = {
+                "op": "add",
+                "id": memo_id(memo["note"], memo.get("author", ""), memo["timestamp"]),
+                "note": memo["note"],
+                "author": memo.get("author", ""),
+                "timestamp": memo["timestamp"],
+            }
+            if record["id"] in logged_ids:
+                continue
+            _append_record(path, record)
+            logged_ids.add(record["id"])
+        try:
+            os.remove(legacy_path)
+        except FileNotFoundError:
+            pass
+    return [legacy_path, path]
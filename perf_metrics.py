@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import bisect
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from atomic_io import write_json_atomic
+
+# -------------------------------------------------------------------
+# ⏱️ 단계별 처리 시간 측정 (프로세스 메모리에 보관)
+#   - 단계마다 누적 구간 히스토그램 + 최근 샘플(p50/p95 계산용)
+#   - with timer("단계"): ... 또는 @timed("단계") 로 측정
+#   - 스냅샷은 METRICS_DUMP_PATH 에 주기적으로 저장 → api.py 의 /metrics 로 제공
+# -------------------------------------------------------------------
+BUCKET_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+RECENT_SAMPLES = 1024
+DUMP_INTERVAL_SECONDS = 10.0
+METRICS_DUMP_PATH = os.environ.get("RSW_METRICS_PATH", os.path.join(tempfile.gettempdir(), "rsw_metrics.json"))
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class StageHistogram:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)  # 마지막 칸: 상한 초과
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.recent.append(elapsed_ms)
+
+    def summary(self):
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "p50_ms": _percentile(recent, 0.50),
+            "p95_ms": _percentile(recent, 0.95),
+            "max_ms": self.max_ms,
+            "buckets": {f"le_{bound}": n for bound, n in zip(BUCKET_BOUNDS_MS, self.buckets)}
+                       | {"le_inf": self.buckets[-1]},
+        }
+
+class PerfRegistry:
+    def __init__(self, dump_path=METRICS_DUMP_PATH, dump_interval_seconds=DUMP_INTERVAL_SECONDS):
+        self.dump_path = dump_path
+        self.dump_interval_seconds = dump_interval_seconds
+        self.started_at = time.time()
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._last_dump = 0.0
+
+    def record(self, stage, elapsed_ms):
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = StageHistogram()
+            histogram.add(elapsed_ms)
+        self._maybe_dump()
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - started) * 1000)
+
+    def timed(self, stage):
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        with self._lock:
+            stages = {stage: histogram.summary() for stage, histogram in sorted(self._stages.items())}
+        return {"pid": os.getpid(), "started_at": self.started_at, "generated_at": time.time(), "stages": stages}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def _maybe_dump(self):
+        now = time.monotonic()
+        if not self.dump_path or now - self._last_dump < self.dump_interval_seconds:
+            return
+        self._last_dump = now
+        try:
+            write_json_atomic(self.dump_path, self.snapshot(), indent=2)
+        except OSError:
+            pass
+
+registry = PerfRegistry()
+timer = registry.timer
+timed = registry.timed
+
+def load_dump(path=METRICS_DUMP_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
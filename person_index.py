@@ -0,0 +1,138 @@
+import os
+import threading
+import unicodedata
+from datetime import timedelta
+
+from schedule_engine import as_date, SHIFT_DAY, SHIFT_NIGHT, SHIFT_VACATION, SHIFT_UNKNOWN
+
+SHIFT_LABELS = {SHIFT_DAY: "주간", SHIFT_NIGHT: "야간", SHIFT_VACATION: "휴가", SHIFT_UNKNOWN: "미등록"}
+
+def normalize_name(name):
+    return "".join(unicodedata.normalize("NFC", str(name)).split()).lower()
+
+def name_substrings(name):
+    return {name[i:j] for i in range(len(name)) for j in range(i + 1, len(name) + 1)}
+
+# -------------------------------------------------------------------
+# 🔍 구성원 인덱스
+#   - 모든 근무표(팀 × 연도 × 월)의 ShiftMatrix 를 한 번씩만 읽어서
+#     정규화된 이름 → [(팀, 연도, 월, 행 번호)] 로 보관
+#   - 이름의 모든 부분 문자열 → 이름 목록 인덱스로 부분 검색도 바로 처리
+#   - 파일 지문이 바뀐 월만 다시 읽음
+# -------------------------------------------------------------------
+class PersonIndex:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._months = {}      # (team, year, month) -> (지문, ShiftMatrix)
+        self._postings = {}    # 정규화 이름 -> [(team, year, month, row)]
+        self._substrings = {}  # 부분 문자열 -> {정규화 이름}
+        self._display_names = {}
+        self._matrices = {}    # 조회용 스냅샷 (갱신 중에도 안전하게 읽기)
+
+    def refresh(self, load_month_matrix, legend_fingerprint=None):
+        # load_month_matrix(team, year, month, schedule_path) -> ShiftMatrix
+        # legend_fingerprint(team): 범례가 바뀌면 근무 구분도 바뀌므로 지문에 포함
+        with self._refresh_lock:
+            self._refresh(load_month_matrix, legend_fingerprint)
+
+    def _refresh(self, load_month_matrix, legend_fingerprint):
+        entries = self.catalog.entries()
+        changed = False
+        seen = set()
+        for (team, year, month), schedule_path in entries:
+            key = (team, year, month)
+            seen.add(key)
+            try:
+                stat = os.stat(schedule_path)
+            except FileNotFoundError:
+                continue
+            fingerprint = (stat.st_mtime_ns, stat.st_size, legend_fingerprint and legend_fingerprint(team))
+            cached = self._months.get(key)
+            if cached and cached[0] == fingerprint:
+                continue
+            try:
+                matrix = load_month_matrix(team, year, month, schedule_path)
+            except (FileNotFoundError, KeyError, ValueError):
+                matrix = None
+            self._months[key] = (fingerprint, matrix)
+            changed = True
+
+        for key in [key for key in self._months if key not in seen]:
+            del self._months[key]
+            changed = True
+
+        if changed or not self._postings:
+            self._rebuild_postings()
+
+    def _rebuild_postings(self):
+        postings = {}
+        display_names = {}
+        for key, (_fingerprint, matrix) in self._months.items():
+            if matrix is None:
+                continue
+            for row, name in enumerate(matrix.people["이름"].tolist()):
+                normalized = normalize_name(name)
+                if not normalized or normalized == "nan":
+                    continue
+                postings.setdefault(normalized, []).append(key + (row,))
+                display_names.setdefault(normalized, name)
+
+        substrings = {}
+        for normalized in postings:
+            for part in name_substrings(normalized):
+                substrings.setdefault(part, set()).add(normalized)
+
+        matrices = {key: matrix for key, (_fingerprint, matrix) in self._months.items() if matrix is not None}
+        with self._lock:
+            self._postings = postings
+            self._substrings = substrings
+            self._display_names = display_names
+            self._matrices = matrices
+
+    def match_names(self, query):
+        normalized = normalize_name(query)
+        with self._lock:
+            return sorted(self._substrings.get(normalized, ()))
+
+    def rows_for(self, query, team, year, month):
+        # 특정 팀 / 월 근무표에서 검색어가 포함된 행 번호
+        rows = []
+        with self._lock:
+            for normalized in self._substrings.get(normalize_name(query), ()):
+                rows.extend(p[3] for p in self._postings[normalized] if p[:3] == (team, year, month))
+        return sorted(rows)
+
+    def upcoming(self, query, start_date, days=60):
+        # 검색어가 포함된 구성원의 start_date 부터 days 일간 근무 (전체 팀)
+        start_date = as_date(start_date)
+        end_date = start_date + timedelta(days=days - 1)
+        months_in_range = set()
+        cursor = start_date.replace(day=1)
+        while cursor <= end_date:
+            months_in_range.add((cursor.year, cursor.month))
+            cursor = (cursor + timedelta(days=32)).replace(day=1)
+
+        results = []
+        with self._lock:
+            names = self._substrings.get(normalize_name(query), ())
+            postings = [(self._display_names[name], p, self._matrices[p[:3]])
+                        for name in names for p in self._postings[name] if p[1:3] in months_in_range]
+        for display_name, (team, year, month, row), matrix in postings:
+            part = matrix.people["파트 구분"].iat[row]
+            for day_index, date in enumerate(matrix.dates):
+                if start_date <= date <= end_date:
+                    code = matrix.codes[row, day_index]
+                    if not isinstance(code, str):
+                        continue
+                    results.append({
+                        "날짜": date,
+                        "이름": display_name,
+                        "팀": team,
+                        "파트": part,
+                        "근무": code,
+                        "구분": SHIFT_LABELS.get(int(matrix.kinds[row, day_index]), "-"),
+                    })
+        results.sort(key=lambda item: (item["날짜"], item["이름"], item["팀"]))
+        return results
@@ -0,0 +1,225 @@
+import os
+import io
+import csv
+import json
+import hashlib
+import tempfile
+from datetime import timedelta
+
+import openpyxl
+
+from atomic_io import FileLock, atomic_output
+from daily_export import EXPORT_FORMAT_VERSION, file_fingerprint  # 근무 분류 규칙이 바뀌면 두 산출물 모두 재생성
+from perf_metrics import timer
+from person_index import SHIFT_LABELS
+from schedule_catalog import model_example_path
+from schedule_engine import WEEKDAYS, SHIFT_DAY, SHIFT_NIGHT, SHIFT_VACATION, month_dates
+
+# -------------------------------------------------------------------
+# 📤 기간 / 여러 팀 근무표 내보내기 (CSV / XLSX)
+#   - roster: 팀 · 파트 · 이름 × 날짜 열 (원본 근무기호)
+#   - daily : 날짜 × 팀 × 근무 구분별 근무자 (일별 JSON 과 같은 내용)
+#   - 요청이 있을 때만 생성하고, 행 단위로 임시 파일에 스트리밍 → rename
+#   - 입력 지문(근무표 / 범례 sha256 + 조건 + 포맷 버전)이 같으면 디스크 캐시를 그대로 제공
+# -------------------------------------------------------------------
+EXPORT_CACHE_DIR = os.environ.get("RSW_EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "rsw_exports"))
+EXPORT_CACHE_MAX_FILES = 64
+MAX_EXPORT_DAYS = 366
+XLSX_MAX_ROWS = 1_048_576  # 엑셀 시트 1개의 최대 행 수 (넘으면 다음 시트로 이어서 기록)
+
+LAYOUTS = {"roster": "근무표", "daily": "일별근무자"}
+FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+class ExportError(ValueError):
+    pass
+
+def date_range(start, end):
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+def month_range(start, end):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def validate_export(teams, start, end, layout, fmt):
+    if not teams:
+        raise ExportError("내보낼 팀을 하나 이상 선택하세요")
+    if end < start:
+        raise ExportError("종료일은 시작일 이후여야 합니다")
+    if (end - start).days >= MAX_EXPORT_DAYS:
+        raise ExportError(f"내보내기 기간은 최대 {MAX_EXPORT_DAYS}일 입니다")
+    if layout not in LAYOUTS:
+        raise ExportError(f"지원하지 않는 형식입니다: {layout}")
+    if fmt not in FORMATS:
+        raise ExportError(f"지원하지 않는 파일 형식입니다: {fmt}")
+
+# -------------------------------------------------------------------
+# 입력 파일 목록 / 캐시 키
+# -------------------------------------------------------------------
+def export_sources(catalog, model_example_root_dir, teams, start, end):
+    # [(팀, 연도, 월, 근무표 경로, 범례 경로)] - 근무표 또는 범례가 없는 월은 제외
+    sources = []
+    for team in teams:
+        model_path = model_example_path(model_example_root_dir, team)
+        if not os.path.exists(model_path):
+            continue
+        for year, month in month_range(start, end):
+            schedule_path = catalog.path_for(team, year, month)
+            if schedule_path and os.path.exists(schedule_path):
+                sources.append((team, year, month, schedule_path, model_path))
+    return sources
+
+def build_range_export_key(sources, teams, start, end, layout, fmt):
+    payload = {
+        "format_version": EXPORT_FORMAT_VERSION,
+        "teams": list(teams),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "layout": layout,
+        "format": fmt,
+        "sources": [[team, year, month, file_fingerprint(schedule_path), file_fingerprint(model_path)]
+                    for team, year, month, schedule_path, model_path in sources],
+    }
+    return hashlib.sha1(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+def export_file_name(teams, start, end, layout, fmt):
+    team_label = teams[0] if len(teams) == 1 else f"{len(teams)}개팀"
+    return f"{team_label}_{start.strftime('%Y%m%d')}-{end.strftime('%Y%m%d')}_{LAYOUTS[layout]}.{fmt}"
+
+# -------------------------------------------------------------------
+# 행 생성기 (월 단위 ShiftMatrix 를 한 번씩만 로드)
+#   load_matrix(team, year, month, schedule_path) -> ShiftMatrix 또는 None
+# -------------------------------------------------------------------
+def _cell(code):
+    return code if isinstance(code, str) else ""
+
+def roster_header(start, end):
+    return ["팀", "파트", "이름"] + [f"{date.strftime('%Y-%m-%d')}({WEEKDAYS[date.weekday()]})"
+                                  for date in date_range(start, end)]
+
+def iter_roster_rows(sources, start, end, load_matrix):
+    dates = date_range(start, end)
+    date_index = {date: index for index, date in enumerate(dates)}
+    by_team = {}
+    for source in sources:
+        by_team.setdefault(source[0], []).append(source)
+
+    for team, team_sources in by_team.items():
+        people = {}  # (이름, 같은 달 동명이인 순번) -> [파트, 이름, 근무기호...]
+        for _team, year, month, schedule_path, _model_path in team_sources:
+            matrix = load_matrix(team, year, month, schedule_path)
+            if matrix is None:
+                continue
+            targets = [(date_index[date], position) for date, position in matrix.positions.items()
+                       if date in date_index]
+            names = matrix.people["이름"].to_numpy()
+            seen = {}
+            for row in matrix.display_order:
+                name = names[row]
+                if not isinstance(name, str):
+                    continue
+                seen[name] = seen.get(name, 0) + 1
+                entry = people.get((name, seen[name]))
+                if entry is None:
+                    entry = people[(name, seen[name])] = [matrix.display_parts[row], name] + [""] * len(dates)
+                for index, position in targets:
+                    entry[2 + index] = _cell(matrix.codes[row, position])
+        for entry in people.values():
+            yield [team, _cell(entry[0])] + entry[1:]
+
+def daily_header():
+    return ["날짜", "팀", "근무 구분", "파트", "이름", "근무"]
+
+def iter_daily_rows(sources, start, end, load_matrix):
+    for year, month in month_range(start, end):
+        matrices = {}
+        for team, source_year, source_month, schedule_path, _model_path in sources:
+            if (source_year, source_month) == (year, month):
+                matrix = load_matrix(team, year, month, schedule_path)
+                if matrix is not None:
+                    matrices[team] = matrix
+        for date in month_dates(year, month):
+            if not start <= date <= end:
+                continue
+            date_label = date.strftime("%Y-%m-%d")
+            for team, matrix in matrices.items():
+                position = matrix.positions.get(date)
+                if position is None:
+                    continue
+                order = matrix.display_order
+                names = matrix.people["이름"].to_numpy()
+                for kind in (SHIFT_DAY, SHIFT_NIGHT, SHIFT_VACATION):
+                    for row in order[matrix.kinds[order, position] == kind]:
+                        yield [date_label, team, SHIFT_LABELS[kind], _cell(matrix.display_parts[row]),
+                               _cell(names[row]), _cell(matrix.codes[row, position])]
+
+# -------------------------------------------------------------------
+# 파일 기록 (행 단위 스트리밍)
+# -------------------------------------------------------------------
+def write_csv_rows(path, header, rows):
+    with atomic_output(path) as f:
+        text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")  # 엑셀에서 바로 열리도록 BOM 포함
+        writer = csv.writer(text)
+        writer.writerow(header)
+        writer.writerows(rows)
+        text.flush()
+        text.detach()
+
+def write_xlsx_rows(path, header, rows, title):
+    workbook = openpyxl.Workbook(write_only=True)  # 행을 바로 임시 파일로 흘려보냄 (메모리 일정)
+    sheet, sheet_rows, sheet_count = None, XLSX_MAX_ROWS, 0
+    for row in rows:
+        if sheet_rows >= XLSX_MAX_ROWS:
+            sheet_count += 1
+            sheet = workbook.create_sheet(title if sheet_count == 1 else f"{title} ({sheet_count})")
+            sheet.freeze_panes = "A2"
+            sheet.append(header)
+            sheet_rows = 1
+        sheet.append(row)
+        sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet(title).append(header)
+    with atomic_output(path) as f:
+        workbook.save(f)
+
+# -------------------------------------------------------------------
+# 🗄️ 디스크 캐시: 같은 입력이면 파일 경로만 반환
+# -------------------------------------------------------------------
+def prune_export_cache(cache_dir=EXPORT_CACHE_DIR, max_files=EXPORT_CACHE_MAX_FILES):
+    try:
+        entries = [entry for entry in os.scandir(cache_dir)
+                   if entry.is_file() and os.path.splitext(entry.name)[1][1:] in FORMATS]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[max_files:]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+def export_range(catalog, model_example_root_dir, teams, start, end, load_matrix,
+                 layout="roster", fmt="csv", cache_dir=EXPORT_CACHE_DIR):
+    validate_export(teams, start, end, layout, fmt)
+    sources = export_sources(catalog, model_example_root_dir, teams, start, end)
+    cache_path = os.path.join(cache_dir, f"{build_range_export_key(sources, teams, start, end, layout, fmt)}.{fmt}")
+
+    with FileLock(cache_path):  # 같은 내보내기를 여러 세션이 동시에 요청해도 한 번만 생성
+        if os.path.exists(cache_path):
+            os.utime(cache_path)  # 최근 사용 표시 (캐시 정리 순서)
+            return cache_path
+        with timer(f"export.{layout}.{fmt}"):
+            if layout == "roster":
+                header, rows = roster_header(start, end), iter_roster_rows(sources, start, end, load_matrix)
+            else:
+                header, rows = daily_header(), iter_daily_rows(sources, start, end, load_matrix)
+            if fmt == "csv":
+                write_csv_rows(cache_path, header, rows)
+            else:
+                write_xlsx_rows(cache_path, header, rows, LAYOUTS[layout])
+    prune_export_cache(cache_dir)
+    return cache_path
@@ -0,0 +1,87 @@
+import os
+import re
+import threading
+
+# -------------------------------------------------------------------
+# 📚 근무표 파일 카탈로그
+#   team_schedules/<팀>/<연도>_<월>월_<팀>_schedule.csv 를 한 번만 스캔하여
+#   (팀, 연도, 월) → 파일 경로 인덱스로 보관
+#   폴더 mtime 이 바뀐 경우에만 다시 스캔
+# -------------------------------------------------------------------
+SCHEDULE_FILE_PATTERN = re.compile(r"^(\d{4})_(\d{1,2})월_(.+)_schedule\.csv$")
+
+def schedule_file_name(team, year, month):
+    return f"{year}_{month}월_{team}_schedule.csv"
+
+def model_example_path(model_example_root_dir, team):
+    return os.path.join(model_example_root_dir, team, f"{team}_model_example.csv")
+
+class ScheduleCatalog:
+    def __init__(self, schedules_root_dir):
+        self.schedules_root_dir = schedules_root_dir
+        self._lock = threading.Lock()
+        self._index = {}
+        self._signature = None
+
+    def _dir_signature(self):
+        if not os.path.isdir(self.schedules_root_dir):
+            return ()
+        signature = [("", os.stat(self.schedules_root_dir).st_mtime_ns)]
+        with os.scandir(self.schedules_root_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    signature.append((entry.name, entry.stat().st_mtime_ns))
+        return tuple(sorted(signature))
+
+    def refresh(self):
+        index = {}
+        if os.path.isdir(self.schedules_root_dir):
+            for team in os.listdir(self.schedules_root_dir):
+                team_dir = os.path.join(self.schedules_root_dir, team)
+                if not os.path.isdir(team_dir):
+                    continue
+                for file_name in os.listdir(team_dir):
+                    match = SCHEDULE_FILE_PATTERN.match(file_name)
+                    if match and match.group(3) == team:
+                        key = (team, int(match.group(1)), int(match.group(2)))
+                        index[key] = os.path.join(team_dir, file_name)
+        with self._lock:
+            self._index = index
+            self._signature = self._dir_signature()
+
+    def refresh_if_changed(self):
+        if self._signature is None or self._signature != self._dir_signature():
+            self.refresh()
+
+    # 업로드 / 삭제 직후 전체 재스캔 없이 인덱스만 갱신
+    def register(self, team, year, month, file_path):
+        with self._lock:
+            self._index[(team, year, month)] = file_path
+
+    def unregister(self, team, year, month):
+        with self._lock:
+            self._index.pop((team, year, month), None)
+
+    def build_path(self, team, year, month):
+        return os.path.join(self.schedules_root_dir, team, schedule_file_name(team, year, month))
+
+    def path_for(self, team, year, month):
+        with self._lock:
+            return self._index.get((team, year, month))
+
+    def resolve_date(self, team, date):
+        return self.path_for(team, date.year, date.month)
+
+    def entries(self, team=None):
+        with self._lock:
+            items = sorted(self._index.items())
+        return [(key, path) for key, path in items if team is None or key[0] == team]
+
+    def teams(self):
+        return sorted({key[0] for key, _path in self.entries()})
+
+    def years(self, team=None):
+        return sorted({key[1] for key, _path in self.entries(team)})
+
+    def months(self, team, year):
+        return sorted(key[2] for key, _path in self.entries(team) if key[1] == year)
@@ -0,0 +1,148 @@
+import os
+import json
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import FileLock
+from schedule_engine import WEEKDAYS, normalize_day_columns
+
+# -------------------------------------------------------------------
+# 🔀 근무표 재업로드 비교 (기존 근무표 ↔ 새 근무표, 셀 단위)
+#   - 구성원은 (이름, 같은 이름 순번), 날짜는 헤더 정규화 결과로 맞춰서 비교
+#   - 구성원 추가 / 삭제 / 순서 · 파트 변경, 날짜 열 변경은 structural 로 표시
+#     (일별 JSON 의 목록 순서 / 파트가 바뀌므로 월 전체를 다시 생성)
+#   - 그 외에는 바뀐 셀이 있는 날짜만 일별 JSON 을 다시 생성
+# -------------------------------------------------------------------
+@dataclass
+class ScheduleDiff:
+    changes: list     # [{"date", "name", "part", "before", "after"}]
+    added: list       # 새로 추가된 구성원 이름
+    removed: list     # 삭제된 구성원 이름
+    structural: bool  # 월 전체 재생성이 필요한 변경 여부
+    dates: list       # 바뀐 셀이 있는 datetime.date 목록
+
+    def is_empty(self):
+        return not (self.changes or self.added or self.removed or self.structural)
+
+def _cell(value):
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+def _people_keys(df):
+    keys, seen = [], {}
+    for row, name in enumerate(df["이름"].tolist()):
+        name = name.strip() if isinstance(name, str) else f"#{row + 1}"
+        seen[name] = seen.get(name, 0) + 1
+        keys.append((name, seen[name]))
+    return keys
+
+def _code_grid(df, columns, dates):
+    if not dates:
+        return np.empty((len(df), 0), dtype=object)
+    grid = df[[columns[date] for date in dates]].astype(object).to_numpy()
+    return np.vectorize(_cell, otypes=[object])(grid)
+
+def diff_schedules(old_df, new_df, year, month):
+    old_schema = normalize_day_columns(old_df.columns, year, month)
+    new_schema = normalize_day_columns(new_df.columns, year, month)
+    dates = [date for date in new_schema.columns if date in old_schema.columns]
+
+    old_keys, new_keys = _people_keys(old_df), _people_keys(new_df)
+    old_rows = {key: row for row, key in enumerate(old_keys)}
+    new_rows = {key: row for row, key in enumerate(new_keys)}
+    old_parts = old_df["파트 구분"].astype(object).tolist()
+    new_parts = new_df["파트 구분"].astype(object).tolist()
+
+    structural = (old_keys != new_keys or list(old_schema.columns) != list(new_schema.columns)
+                  or [_cell(part) for part in old_parts] != [_cell(part) for part in new_parts])
+
+    old_grid = _code_grid(old_df, old_schema.columns, dates)
+    new_grid = _code_grid(new_df, new_schema.columns, dates)
+    common = [key for key in new_keys if key in old_rows]
+    changed_dates = set()
+    changes = []
+    if common and dates:
+        old_aligned = old_grid[[old_rows[key] for key in common]]
+        new_aligned = new_grid[[new_rows[key] for key in common]]
+        cells = sorted(zip(*np.nonzero(old_aligned != new_aligned)), key=lambda cell: (cell[1], cell[0]))
+        for index, position in cells:  # 날짜 → 구성원 순
+            key = common[index]
+            changes.append({
+                "date": dates[position],
+                "name": key[0],
+                "part": _cell(new_parts[new_rows[key]]),
+                "before": old_aligned[index, position],
+                "after": new_aligned[index, position],
+            })
+            changed_dates.add(dates[position])
+
+    return ScheduleDiff(
+        changes=changes,
+        added=[key[0] for key in new_keys if key not in old_rows],
+        removed=[key[0] for key in old_keys if key not in new_rows],
+        structural=structural,
+        dates=sorted(changed_dates),
+    )
+
+# -------------------------------------------------------------------
+# 📝 변경 이력 (team_changelog/<팀>/<YYYY-MM>_changelog.jsonl, 추가 전용)
+#   한 줄 = 변경 1건, message 는 사람이 읽는 요약 (예: 홍길동 03(월): 주 → 휴가(주))
+# -------------------------------------------------------------------
+CHANGELOG_COLUMNS = ["uploaded_at", "author", "file", "change", "date", "name", "part", "before", "after", "message"]
+
+def changelog_path(changelog_root_dir, team, year, month):
+    return os.path.join(changelog_root_dir, team, f"{year}-{month:02d}_changelog.jsonl")
+
+def format_change(change):
+    date = change["date"]
+    return (f"{change['name']} {date.day:02d}({WEEKDAYS[date.weekday()]}): "
+            f"{change['before'] or '-'} → {change['after'] or '-'}")
+
+def changelog_entries(diff, year, month, uploaded_at, author="", file_name="", created_people=None):
+    base = {"uploaded_at": uploaded_at, "author": author, "file": file_name}
+    if diff is None:
+        return [dict(base, change="created", message=f"{year}년 {month}월 근무표 신규 등록 ({created_people}명)")]
+    entries = [dict(base, change="cell", date=change["date"].strftime("%Y-%m-%d"), name=change["name"],
+                    part=change["part"], before=change["before"], after=change["after"],
+                    message=format_change(change))
+               for change in diff.changes]
+    entries += [dict(base, change="added", name=name, message=f"{name}: 구성원 추가") for name in diff.added]
+    entries += [dict(base, change="removed", name=name, message=f"{name}: 구성원 삭제") for name in diff.removed]
+    if not entries:
+        entries.append(dict(base, change="unchanged", message="근무 내용 변경 없음"))
+    return entries
+
+def append_changelog(path, entries):
+    if not entries:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+    with FileLock(path):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def load_changelog(path):
+    # 최신 변경부터 반환 (기록 중에 잘린 마지막 줄은 무시)
+    entries = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return pd.DataFrame(entries[::-1], columns=CHANGELOG_COLUMNS)
+
+def query_changelog(changelog, name=None, date=None):
+    if name:
+        changelog = changelog[changelog["name"].fillna("").str.contains(name.strip(), regex=False)]
+    if date:
+        changelog = changelog[changelog["date"] == date]
+    return changelog
@@ -0,0 +1,261 @@
+import re
+import calendar
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from datetime import datetime, date as date_type
+
+# -------------------------------------------------------------------
+# 근무 분류 코드 (셀 1개당 int8 1개)
+# -------------------------------------------------------------------
+SHIFT_OFF = 0
+SHIFT_DAY = 1
+SHIFT_NIGHT = 2
+SHIFT_VACATION = 3
+SHIFT_UNKNOWN = 4  # 범례에 없는 근무기호 (근무자 표에는 넣지 않고 따로 안내)
+
+SHIFT_KEYS = {
+    SHIFT_DAY: "day_shift",
+    SHIFT_NIGHT: "night_shift",
+    SHIFT_VACATION: "vacation_shift",
+}
+
+WEEKDAYS = ['월', '화', '수', '목', '금', '토', '일']
+VACATION_KEYWORDS = ["휴가(주)", "대휴(주)", "대휴", "경조", "연차", "휴가(야)", "휴가(숙)", "건검(주)"]
+EXCLUDED_KEYWORDS = ["휴", "숙", "대휴(주)", "휴대(주)"]
+
+# -------------------------------------------------------------------
+# 월 전체 근무 분류 결과 (구성원 × 날짜)
+# -------------------------------------------------------------------
+@dataclass
+class ShiftMatrix:
+    people: pd.DataFrame  # 행 순서 그대로의 "파트 구분", "이름"
+    dates: list           # datetime.date 목록 (열 순서)
+    columns: dict         # datetime.date -> 원본 CSV 열 이름
+    codes: np.ndarray     # 원본 근무기호 (object, 구성원 × 날짜)
+    kinds: np.ndarray     # 분류 코드 (int8, 구성원 × 날짜)
+    positions: dict       # datetime.date -> codes / kinds 의 열 번호
+    display_order: np.ndarray  # 화면 표시용 행 순서 (총괄 → 파트 → 이름)
+    display_parts: np.ndarray  # 화면 표시용 파트 이름 (총괄 → 팀장)
+    unknown: dict         # 범례에 없는 근무기호 -> 셀 수
+
+    def has_date(self, date):
+        return as_date(date) in self.positions
+
+def as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+# -------------------------------------------------------------------
+# 날짜 → 표시용 열 이름 (예: 1(금))
+# -------------------------------------------------------------------
+def day_column_label(date):
+    return f"{date.day}({WEEKDAYS[date.weekday()]})"
+
+# -------------------------------------------------------------------
+# 📐 헤더 정규화: 파일을 읽을 때 한 번만 모든 날짜 열 → datetime.date 매핑
+#   - 1(금) / 01(금) / 앞뒤 공백 모두 같은 날짜로 인식
+#   - 요일이 실제 날짜와 다르면 mismatches 에 기록 (날짜 번호 기준으로 매핑)
+#   - 다음 달 미리보기 열(1(토).1) 등 해석할 수 없는 날짜 열은 ignored 에 기록
+# -------------------------------------------------------------------
+DAY_HEADER_PATTERN = re.compile(r"^(\d{1,2})\(([월화수목금토일])\)$")
+DAY_LIKE_PATTERN = re.compile(r"^\d{1,2}\(")
+
+@dataclass
+class DaySchema:
+    year: int
+    month: int
+    columns: dict     # datetime.date -> 원본 CSV 열 이름
+    mismatches: list  # [(원본 열 이름, 올바른 열 이름)]
+    ignored: list     # 날짜로 해석하지 않은 열 이름
+
+def normalize_day_columns(columns, year, month):
+    last_day = calendar.monthrange(year, month)[1]
+    resolved, mismatches, ignored = {}, [], []
+    for col in columns:
+        label = str(col).strip()
+        match = DAY_HEADER_PATTERN.match(label)
+        if match is None:
+            if DAY_LIKE_PATTERN.match(label):
+                ignored.append(col)
+            continue
+        day = int(match.group(1))
+        if not 1 <= day <= last_day:
+            ignored.append(col)
+            continue
+        date = date_type(year, month, day)
+        if date in resolved:
+            ignored.append(col)
+            continue
+        if match.group(2) != WEEKDAYS[date.weekday()]:
+            mismatches.append((col, day_column_label(date)))
+        resolved[date] = col
+    return DaySchema(year=year, month=month, columns=dict(sorted(resolved.items())),
+                     mismatches=mismatches, ignored=ignored)
+
+# -------------------------------------------------------------------
+# 📖 범례 컴파일: 범례 파일 버전마다 한 번만 근무기호 → 분류 코드 조회표 생성
+#   조회 순서: 기본 휴가 / 휴무 기호 → 범례 근무기호 → 와일드카드(예: 주-*) 최장 접두어
+#             → 접미 변형(주-B, 주-국(검) → 주) → 미등록(SHIFT_UNKNOWN)
+#   실제 근무 문구의 "주" / "야" 판정은 컴파일할 때 범례 행마다 한 번만 수행
+# -------------------------------------------------------------------
+LEGEND_WILDCARD = "*"
+FAMILY_SEPARATOR = "-"
+BUILTIN_CODES = {**{code: SHIFT_OFF for code in EXCLUDED_KEYWORDS},
+                 **{code: SHIFT_VACATION for code in VACATION_KEYWORDS}}  # 범례보다 우선
+
+def classify_actual(actual):
+    if not isinstance(actual, str):
+        return SHIFT_OFF
+    if "주" in actual:
+        return SHIFT_DAY
+    if "야" in actual:
+        return SHIFT_NIGHT
+    return SHIFT_OFF
+
+class CompiledLegend:
+    def __init__(self, exact, prefixes):
+        self.exact = exact  # 근무기호 -> 분류 코드
+        self.prefixes = sorted(prefixes, key=lambda item: len(item[0]), reverse=True)  # [(접두어, 분류 코드)]
+        self._resolved = {}
+
+    def _lookup(self, code):
+        kind = BUILTIN_CODES.get(code)
+        return self.exact.get(code) if kind is None else kind
+
+    def _resolve(self, code):
+        if not isinstance(code, str) or not code.strip():
+            return SHIFT_OFF
+        code = code.strip()
+        kind = self._lookup(code)
+        if kind is not None:
+            return kind
+        for prefix, kind in self.prefixes:
+            if code.startswith(prefix):
+                return kind
+        base = code
+        while FAMILY_SEPARATOR in base:
+            base = base.rsplit(FAMILY_SEPARATOR, 1)[0]
+            kind = self._lookup(base)
+            if kind is not None:
+                return kind
+        return SHIFT_UNKNOWN
+
+    def classify(self, code):
+        kind = self._resolved.get(code)
+        if kind is None:
+            kind = self._resolved[code] = self._resolve(code)
+        return kind
+
+def compile_legend(df_model):
+    df_model = df_model.dropna(subset=["실제 근무", "팀 근무기호"])
+    exact, prefixes = {}, {}
+    for code, actual in zip(df_model["팀 근무기호"], df_model["실제 근무"]):
+        code = str(code).strip()
+        if code.endswith(LEGEND_WILDCARD):
+            prefixes[code[:-len(LEGEND_WILDCARD)]] = classify_actual(actual)
+        else:
+            exact[code] = classify_actual(actual)  # 같은 기호가 여러 행이면 마지막 행 기준
+    return CompiledLegend(exact, list(prefixes.items()))
+
+def shared_categories(day_frame):
+    # 모든 날짜 열이 같은 코드표를 공유하는 Categorical 이면 그 코드표 반환
+    categories = None
+    for dtype in day_frame.dtypes:
+        if not isinstance(dtype, pd.CategoricalDtype):
+            return None
+        if categories is None:
+            categories = dtype.categories
+        elif not categories.equals(dtype.categories):
+            return None
+    return categories
+
+# -------------------------------------------------------------------
+# 🚀 월 전체를 한 번에 분류 (고유 근무기호만 판정 후 정수 인덱싱)
+# -------------------------------------------------------------------
+def build_shift_matrix(df_schedule, legend, schema):
+    columns = schema.columns
+    dates = list(columns)
+    people = df_schedule[["파트 구분", "이름"]].reset_index(drop=True)
+
+    day_frame = df_schedule[[columns[date] for date in dates]]
+    categories = shared_categories(day_frame)
+    if categories is not None:
+        # 압축 저장(.rswc)에서 읽은 근무표: 코드표 인덱스를 그대로 사용 (factorize 생략)
+        uniques = list(categories)
+        code_index = np.column_stack([day_frame[col].cat.codes.to_numpy() for col in day_frame.columns])
+        codes = np.array(uniques + [np.nan], dtype=object)[code_index]
+        flat_index = code_index.ravel()
+    else:
+        if dates:
+            codes = day_frame.to_numpy(dtype=object)
+        else:
+            codes = np.empty((len(people), 0), dtype=object)
+        flat_index, uniques = pd.factorize(codes.ravel(), use_na_sentinel=True)
+
+    lookup = np.array([legend.classify(code) for code in uniques] + [SHIFT_OFF], dtype=np.int8)
+    kinds = lookup[flat_index].reshape(codes.shape)  # NaN(-1)은 마지막 SHIFT_OFF로 매핑
+
+    unknown = {}
+    unknown_index = np.flatnonzero(lookup[:-1] == SHIFT_UNKNOWN)
+    if len(unknown_index):
+        counts = np.bincount(flat_index[flat_index >= 0], minlength=len(uniques))
+        unknown = {uniques[i]: int(counts[i]) for i in unknown_index if counts[i]}
+
+    display_order, display_parts = build_display_order(people)
+    return ShiftMatrix(people=people, dates=dates, columns=columns, codes=codes, kinds=kinds,
+                       positions={date: index for index, date in enumerate(dates)},
+                       display_order=display_order, display_parts=display_parts, unknown=unknown)
+
+# -------------------------------------------------------------------
+# 화면 표시 순서 / 파트 이름은 날짜와 무관하므로 월 단위로 한 번만 계산
+# -------------------------------------------------------------------
+def build_display_order(people):
+    parts = people["파트 구분"].astype(object)
+    is_leader = parts.map(lambda part: isinstance(part, str) and "총괄" in part)
+    order = (people.assign(우선순위=(~is_leader).astype(int))
+             .sort_values(["우선순위", "파트 구분", "이름"], kind="stable").index.to_numpy())
+    display_parts = parts.where(~(parts == "총괄"), "팀장").to_numpy()
+    return order, display_parts
+
+# -------------------------------------------------------------------
+# 근무표 + 범례 DataFrame → 월 전체 분류 결과 (UI 밖에서도 그대로 사용)
+# -------------------------------------------------------------------
+def month_dates(year, month):
+    return [date_type(year, month, day) for day in range(1, calendar.monthrange(year, month)[1] + 1)]
+
+def build_month_matrix(df_schedule, legend, year, month):
+    schema = normalize_day_columns(df_schedule.columns, year, month)
+    return build_shift_matrix(df_schedule, legend, schema)
+
+# -------------------------------------------------------------------
+# 특정 날짜 / 분류의 근무자 추출
+# -------------------------------------------------------------------
+def shift_frame(matrix, date, kind):
+    day_index = matrix.positions.get(as_date(date))
+    if day_index is None:
+        return pd.DataFrame(columns=["파트", "이름", "근무"])
+    rows = np.flatnonzero(matrix.kinds[:, day_index] == kind)
+    return pd.DataFrame({
+        "파트": matrix.people["파트 구분"].to_numpy()[rows],
+        "이름": matrix.people["이름"].to_numpy()[rows],
+        "근무": matrix.codes[rows, day_index],
+    })
+
+def shift_board(matrix, date, kind):
+    # 화면용: 표시 순서대로 정렬 + 총괄 → 팀장 (JSON 산출물은 shift_frame 그대로 사용)
+    day_index = matrix.positions.get(as_date(date))
+    if day_index is None:
+        return pd.DataFrame(columns=["파트", "이름", "근무"])
+    order = matrix.display_order
+    rows = order[matrix.kinds[order, day_index] == kind]
+    return pd.DataFrame({
+        "파트": matrix.display_parts[rows],
+        "이름": matrix.people["이름"].to_numpy()[rows],
+        "근무": matrix.codes[rows, day_index],
+    })
+
+def build_day_schedule(matrix, date):
+    schedule_data = {"date": date.strftime('%Y-%m-%d')}
+    for kind, key in SHIFT_KEYS.items():
+        schedule_data[key] = shift_frame(matrix, date, kind).to_dict(orient="records")
+    return schedule_data
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from schedule_engine import SHIFT_DAY, SHIFT_NIGHT, SHIFT_VACATION
+
+# -------------------------------------------------------------------
+# 📈 근무 인원 분석 (팀 / 파트 × 날짜별 주간 · 야간 · 휴가 인원)
+#   - 월 단위 ShiftMatrix 1개당 행렬 곱 한 번으로 파트별 인원 집계
+#     (파트 원-핫 행렬 × 분류 코드 마스크)
+#   - 공백: 그 달에 해당 근무를 맡는 파트(또는 팀)가 특정 날짜에 0명인 경우
+#     (팀장은 교대 인원이 아니므로 공백 판정에서 제외)
+#   - 결과는 입력 지문별로 캐싱하는 쪽(main.py)에서 월 단위로 재사용
+# -------------------------------------------------------------------
+COVERAGE_KINDS = {SHIFT_DAY: "주간", SHIFT_NIGHT: "야간", SHIFT_VACATION: "휴가"}
+GAP_KINDS = ["주간", "야간"]
+TEAM_TOTAL = "전체"
+UNASSIGNED_PART = "미지정"
+LEADER_PART = "팀장"
+COVERAGE_COLUMNS = ["팀", "파트", "날짜"] + list(COVERAGE_KINDS.values()) + [f"{kind} 공백" for kind in GAP_KINDS]
+
+def empty_coverage():
+    return pd.DataFrame(columns=COVERAGE_COLUMNS)
+
+def month_coverage(matrix, team):
+    if matrix is None or not matrix.dates:
+        return empty_coverage()
+    parts = pd.Series(matrix.display_parts, dtype=object).fillna(UNASSIGNED_PART).astype(str)
+    part_index, part_labels = pd.factorize(parts, sort=True)
+    onehot = np.zeros((len(part_labels), len(parts)), dtype=np.int32)
+    onehot[part_index, np.arange(len(parts))] = 1
+
+    # 파트별 인원 (파트 수 × 날짜 수) → 근무 기록이 없는 파트는 제외하고 맨 앞에 팀 합계 행 추가
+    counts = {name: onehot @ (matrix.kinds == kind).astype(np.int32) for kind, name in COVERAGE_KINDS.items()}
+    staffed = np.flatnonzero(sum(values.sum(axis=1) for values in counts.values()) > 0)
+    counts = {name: np.vstack([values.sum(axis=0, keepdims=True), values[staffed]]) for name, values in counts.items()}
+    labels = np.concatenate([[TEAM_TOTAL], np.asarray(part_labels, dtype=object)[staffed]])
+
+    dates = pd.to_datetime(matrix.dates).to_numpy()
+    columns = {
+        "팀": np.full(len(labels) * len(dates), team, dtype=object),
+        "파트": np.repeat(labels, len(dates)),
+        "날짜": np.tile(dates, len(labels)),
+    }
+    for name, values in counts.items():
+        columns[name] = values.ravel()
+    for name in GAP_KINDS:
+        # 그 달에 한 번이라도 해당 근무를 맡은 파트(팀장 제외)가 0명인 날짜
+        covers = counts[name].any(axis=1, keepdims=True) & (labels != LEADER_PART)[:, None]
+        columns[f"{name} 공백"] = ((counts[name] == 0) & covers).ravel()
+    return pd.DataFrame(columns)
+
+def coverage_report(frames):
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return empty_coverage()
+    return pd.concat(frames, ignore_index=True)
+
+# -------------------------------------------------------------------
+# 요약 표 (팀 · 파트별 평균 / 최소 인원, 공백 일수)
+# -------------------------------------------------------------------
+def coverage_summary(report):
+    if report.empty:
+        return pd.DataFrame(columns=["팀", "파트", "일수", "평균 주간", "최소 주간", "평균 야간", "최소 야간",
+                                     "주간 공백일", "야간 공백일", "휴가 연인원"])
+    grouped = report.groupby(["팀", "파트"], sort=False)
+    summary = grouped.agg(**{
+        "일수": ("날짜", "size"),
+        "평균 주간": ("주간", "mean"),
+        "최소 주간": ("주간", "min"),
+        "평균 야간": ("야간", "mean"),
+        "최소 야간": ("야간", "min"),
+        "주간 공백일": ("주간 공백", "sum"),
+        "야간 공백일": ("야간 공백", "sum"),
+        "휴가 연인원": ("휴가", "sum"),
+    }).reset_index()
+    return summary.round({"평균 주간": 1, "평균 야간": 1})
+
+def coverage_gaps(report):
+    rows = []
+    for name in GAP_KINDS:
+        gaps = report.loc[report[f"{name} 공백"], ["날짜", "팀", "파트"]]
+        rows.append(gaps.assign(공백=name))
+    gaps = pd.concat(rows, ignore_index=True)
+    return gaps.sort_values(["날짜", "팀", "파트"], kind="stable").reset_index(drop=True)
@@ -0,0 +1,133 @@
+import codecs
+import hashlib
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import openpyxl
+from charset_normalizer import from_bytes
+
+from atomic_io import write_bytes_atomic
+from columnar_store import DAY_COLUMN_PATTERN, write_columnar
+
+# -------------------------------------------------------------------
+# 🔼 업로드 파일 수집 (근무표 / 범례)
+#   - 앞부분 샘플로 인코딩을 한 번만 판별 → 한 번만 파싱
+#   - 필수 열 / 날짜 열 검사 후 CSV(utf-8-sig) 를 임시 파일 → rename 으로 교체
+#   - xlsx 는 read_only 모드로 행 단위 스트리밍
+# -------------------------------------------------------------------
+SAMPLE_BYTES = 64 * 1024
+SCHEDULE_REQUIRED_COLUMNS = ["파트 구분", "이름"]
+LEGEND_REQUIRED_COLUMNS = ["팀 근무기호", "실제 근무"]
+ENCODING_SUPERSETS = {"euc_kr": "cp949", "euc-kr": "cp949"}
+
+class UploadError(ValueError):
+    pass
+
+def detect_encoding(sample):
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    best = from_bytes(sample).best()
+    if best is None:
+        return "cp949"
+    return ENCODING_SUPERSETS.get(best.encoding, best.encoding)
+
+def _dedupe_columns(header):
+    # pandas 와 같은 규칙: 빈 헤더 → "Unnamed: n", 중복 헤더 → "이름.1"
+    columns, seen = [], {}
+    for index, name in enumerate(header):
+        name = f"Unnamed: {index}" if name is None else str(name).strip()
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+def read_xlsx_rows(uploaded_file):
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise UploadError("빈 파일입니다")
+        columns = _dedupe_columns(header)
+        records = [row[:len(columns)] for row in rows if any(value is not None for value in row)]
+    finally:
+        workbook.close()
+    return pd.DataFrame.from_records(records, columns=columns)
+
+def read_uploaded_frame(uploaded_file):
+    uploaded_file.seek(0)
+    if uploaded_file.name.endswith(".xlsx"):
+        return read_xlsx_rows(uploaded_file)
+    if not uploaded_file.name.endswith(".csv"):
+        raise UploadError("xlsx 또는 csv 파일만 업로드할 수 있습니다")
+    encoding = detect_encoding(uploaded_file.read(SAMPLE_BYTES))
+    uploaded_file.seek(0)
+    try:
+        df = pd.read_csv(uploaded_file, encoding=encoding)
+    except UnicodeDecodeError as e:
+        raise UploadError(f"파일 인코딩({encoding})을 읽을 수 없습니다: {e}")
+    df.columns = [str(col).strip() for col in df.columns]
+    return df
+
+# -------------------------------------------------------------------
+# 스키마 검사
+# -------------------------------------------------------------------
+def validate_columns(df, required_columns):
+    missing = [col for col in required_columns if col not in df.columns]
+    if missing:
+        raise UploadError(f"필수 열이 없습니다: {', '.join(missing)}")
+
+def validate_schedule(df):
+    validate_columns(df, SCHEDULE_REQUIRED_COLUMNS)
+    if not any(DAY_COLUMN_PATTERN.match(str(col)) for col in df.columns):
+        raise UploadError("날짜 열(예: 1(월), 01(월))이 없습니다")
+
+def validate_legend(df):
+    validate_columns(df, LEGEND_REQUIRED_COLUMNS)
+
+# -------------------------------------------------------------------
+# 저장: 정규화된 CSV 를 원자적으로 교체 후 파생 산출물 생성
+# -------------------------------------------------------------------
+def _normalized_csv_bytes(df):
+    buffer = BytesIO()
+    df.to_csv(buffer, index=False, encoding="utf-8-sig")
+    return buffer.getvalue()
+
+def _as_stored_dtypes(df):
+    # 저장된 CSV 를 다시 읽었을 때와 같은 dtype 으로 맞춤 (다시 파싱하지 않음)
+    #   csv 업로드는 이미 read_csv 결과이므로 그대로, xlsx 의 혼합 / 날짜 / 빈 열만 변환
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object or pd.api.types.is_datetime64_any_dtype(series):
+            if series.isna().all():
+                series = pd.Series(np.nan, index=series.index, dtype="float64")
+            else:
+                series = series.where(series.isna(), series.astype(str)).astype("str")
+        columns[col] = series
+    return pd.DataFrame(columns)
+
+def ingest_schedule(uploaded_file, csv_path):
+    df = _as_stored_dtypes(read_uploaded_frame(uploaded_file))
+    validate_schedule(df)
+    data = _normalized_csv_bytes(df)
+    write_bytes_atomic(csv_path, data)
+    # 압축 저장본은 메모리상의 정규화 결과 + 이미 가진 바이트의 해시로 생성 (파일을 다시 읽지 않음)
+    write_columnar(csv_path, df, sha256=hashlib.sha256(data).hexdigest())
+    return df  # 저장된 CSV 를 다시 읽은 것과 같은 DataFrame (기존 근무표와 비교용)
+
+def ingest_legend(uploaded_file, csv_path):
+    df = read_uploaded_frame(uploaded_file)
+    validate_legend(df)
+    write_bytes_atomic(csv_path, _normalized_csv_bytes(df))
+    return df